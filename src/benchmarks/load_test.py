@@ -0,0 +1,395 @@
+"""Нагрузочное тестирование сервисов с конкурентными виртуальными пользователями.
+
+Виртуальные пользователи выполняют заданную смесь операций
+(``create_task``, ``assign_task``, ``update_task_status``,
+``get_tasks_by_user``, ``get_project_progress``) в потоках, процессах
+или корутинах asyncio. По итогам выводятся перцентили задержки
+p50/p95/p99, доля ошибок и пропускная способность по секундам.
+
+Запуск:
+    python -m src.benchmarks.load_test --users 32 --duration 10 --mode thread --backend memory
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from src.models.task import TaskStatus, Priority
+from src.repositories.mmap_task_repository import MmapTaskRepository
+from src.repositories.project_repository import ProjectRepository
+from src.repositories.task_repository import TaskRepository
+from src.repositories.tiered_store import TieredStore
+from src.repositories.user_repository import UserRepository
+from src.services.project_service import ProjectService
+from src.services.task_service import TaskService
+from src.services.user_service import UserService
+
+OPERATIONS = (
+    "create_task",
+    "assign_task",
+    "update_task_status",
+    "get_tasks_by_user",
+    "get_project_progress",
+)
+BACKENDS = ("memory", "tiered", "mmap")
+MODES = ("thread", "process", "asyncio")
+
+DEFAULT_MIX = {
+    "create_task": 30,
+    "assign_task": 20,
+    "update_task_status": 20,
+    "get_tasks_by_user": 15,
+    "get_project_progress": 15,
+}
+
+
+class Sample(NamedTuple):
+    """Результат одной операции."""
+    operation: str
+    started: float  # Секунды от начала теста
+    latency: float  # Секунды
+    ok: bool
+
+
+class LoadConfig(NamedTuple):
+    """Параметры нагрузочного теста."""
+    users: int = 16
+    duration: float = 10.0
+    mode: str = "thread"
+    backend: str = "memory"
+    mix: Dict[str, int] = DEFAULT_MIX
+    seed_users: int = 100
+    seed_projects: int = 50
+    seed_tasks: int = 5000
+    think_time: float = 0.0
+    processes: Optional[int] = None
+    seed: int = 42
+
+
+class Workload:
+    """Сервисы выбранного хранилища с начальными данными."""
+    
+    def __init__(self, config: LoadConfig):
+        """Создать хранилище и заполнить его начальными данными.
+        
+        Args:
+            config: Параметры теста
+        """
+        self._tmpdir = tempfile.mkdtemp(prefix="load_test_")
+        self._store = None
+        user_repo = UserRepository()
+        if config.backend == "memory":
+            project_repo, task_repo = ProjectRepository(), TaskRepository()
+        elif config.backend == "tiered":
+            self._store = TieredStore(
+                os.path.join(self._tmpdir, "segment.bin"),
+                max_resident=max(config.seed_tasks // 4, 1000)
+            )
+            project_repo, task_repo = self._store.project_repo, self._store.task_repo
+        elif config.backend == "mmap":
+            project_repo = ProjectRepository()
+            task_repo = MmapTaskRepository(os.path.join(self._tmpdir, "tasks.bin"))
+        else:
+            raise ValueError(f"Неизвестное хранилище: {config.backend}")
+        
+        self.task_repo = task_repo
+        self.user_service = UserService(user_repo)
+        self.project_service = ProjectService(project_repo, user_repo, task_repo=task_repo)
+        self.task_service = TaskService(task_repo, project_repo, user_repo)
+        # Хранилища не потокобезопасны, поэтому вызовы из потоков сериализуются
+        self.lock = nullcontext() if config.mode == "asyncio" else threading.Lock()
+        
+        rng = random.Random(config.seed)
+        self.user_ids = [
+            self.user_service.register_user(f"user{i}", f"user{i}@example.com").id
+            for i in range(config.seed_users)
+        ]
+        self.project_ids = [
+            self.project_service.create_project(f"project{i}", "", rng.choice(self.user_ids)).id
+            for i in range(config.seed_projects)
+        ]
+        self.task_ids = [
+            self.task_service.create_task(f"task{i}", "", rng.choice(self.project_ids)).id
+            for i in range(config.seed_tasks)
+        ]
+    
+    def operation(self, name: str, rng: random.Random) -> Callable[[], object]:
+        """Подготовить вызов операции со случайными аргументами.
+        
+        Args:
+            name: Название операции
+            rng: Генератор случайных чисел виртуального пользователя
+        
+        Returns:
+            Функция без аргументов, выполняющая операцию
+        """
+        if name == "create_task":
+            project_id = rng.choice(self.project_ids)
+            priority = rng.choice(list(Priority))
+            
+            def create():
+                task = self.task_service.create_task("load", "", project_id, priority)
+                self.task_ids.append(task.id)
+                return task
+            return create
+        if name == "assign_task":
+            task_id, user_id = rng.choice(self.task_ids), rng.choice(self.user_ids)
+            return lambda: self.task_service.assign_task(task_id, user_id)
+        if name == "update_task_status":
+            task_id, status = rng.choice(self.task_ids), rng.choice(list(TaskStatus))
+            return lambda: self.task_service.update_task_status(task_id, status)
+        if name == "get_tasks_by_user":
+            user_id = rng.choice(self.user_ids)
+            return lambda: self.task_service.get_tasks_by_user(user_id)
+        if name == "get_project_progress":
+            project_id = rng.choice(self.project_ids)
+            return lambda: self.project_service.get_project_progress(project_id)
+        raise ValueError(f"Неизвестная операция: {name}")
+    
+    def close(self) -> None:
+        """Освободить ресурсы хранилища."""
+        if isinstance(self.task_repo, MmapTaskRepository):
+            self.task_repo.close()
+        if self._store is not None:
+            self._store.close()
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+
+def _pick_operations(config: LoadConfig, rng: random.Random, count: int) -> List[str]:
+    names = list(config.mix)
+    return rng.choices(names, weights=[config.mix[n] for n in names], k=count)
+
+
+def _run_one(workload: Workload, name: str, rng: random.Random, origin: float) -> Sample:
+    call = workload.operation(name, rng)
+    started = time.perf_counter()
+    ok = True
+    try:
+        with workload.lock:
+            call()
+    except Exception:
+        ok = False
+    finished = time.perf_counter()
+    return Sample(name, started - origin, finished - started, ok)
+
+
+def _virtual_user(workload: Workload, config: LoadConfig, user_index: int, origin: float) -> List[Sample]:
+    rng = random.Random(config.seed * 1_000_003 + user_index)
+    deadline = origin + config.duration
+    samples = []
+    while time.perf_counter() < deadline:
+        for name in _pick_operations(config, rng, 64):
+            samples.append(_run_one(workload, name, rng, origin))
+            if config.think_time:
+                time.sleep(rng.expovariate(1 / config.think_time))
+            if time.perf_counter() >= deadline:
+                break
+    return samples
+
+
+async def _async_user(workload: Workload, config: LoadConfig, user_index: int, origin: float) -> List[Sample]:
+    rng = random.Random(config.seed * 1_000_003 + user_index)
+    deadline = origin + config.duration
+    samples = []
+    while time.perf_counter() < deadline:
+        name = _pick_operations(config, rng, 1)[0]
+        samples.append(_run_one(workload, name, rng, origin))
+        # Передаем управление другим пользователям даже без паузы
+        await asyncio.sleep(rng.expovariate(1 / config.think_time) if config.think_time else 0)
+    return samples
+
+
+async def _run_asyncio(workload: Workload, config: LoadConfig, origin: float) -> List[Sample]:
+    results = await asyncio.gather(*(
+        _async_user(workload, config, i, origin) for i in range(config.users)
+    ))
+    return [sample for samples in results for sample in samples]
+
+
+def _run_process_shard(config: LoadConfig, user_indices: List[int]) -> List[Sample]:
+    """Выполнить группу виртуальных пользователей в отдельном процессе."""
+    workload = Workload(config)
+    try:
+        origin = time.perf_counter()
+        samples = []
+        # Пользователи процесса работают в потоках над общей копией хранилища
+        with ThreadPoolExecutor(max_workers=len(user_indices)) as pool:
+            futures = [
+                pool.submit(_virtual_user, workload, config, i, origin)
+                for i in user_indices
+            ]
+            for future in futures:
+                samples.extend(future.result())
+        return samples
+    finally:
+        workload.close()
+
+
+def run_load_test(config: LoadConfig) -> List[Sample]:
+    """Выполнить нагрузочный тест.
+    
+    В режиме ``process`` каждый процесс получает собственную копию
+    хранилища с теми же начальными данными, то есть моделируется
+    горизонтальное масштабирование на независимые экземпляры.
+    
+    Args:
+        config: Параметры теста
+    
+    Returns:
+        Результаты всех операций
+    """
+    if config.mode not in MODES:
+        raise ValueError(f"Неизвестный режим: {config.mode}")
+    unknown = set(config.mix) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Неизвестные операции: {', '.join(sorted(unknown))}")
+    
+    if config.mode == "process":
+        processes = min(config.processes or os.cpu_count() or 1, config.users)
+        shards = [list(range(config.users))[i::processes] for i in range(processes)]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = pool.map(_run_process_shard, [config] * processes, shards)
+            return [sample for samples in results for sample in samples]
+    
+    workload = Workload(config)
+    try:
+        origin = time.perf_counter()
+        if config.mode == "asyncio":
+            return asyncio.run(_run_asyncio(workload, config, origin))
+        with ThreadPoolExecutor(max_workers=config.users) as pool:
+            futures = [
+                pool.submit(_virtual_user, workload, config, i, origin)
+                for i in range(config.users)
+            ]
+            return [sample for future in futures for sample in future.result()]
+    finally:
+        workload.close()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Получить перцентиль методом ближайшего ранга.
+    
+    Args:
+        sorted_values: Отсортированные значения
+        fraction: Доля от 0 до 1
+    
+    Returns:
+        Значение перцентиля (0.0 для пустого списка)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(samples: List[Sample], duration: float) -> Dict[str, Dict[str, float]]:
+    """Посчитать статистику по операциям.
+    
+    Args:
+        samples: Результаты операций
+        duration: Длительность теста в секундах
+    
+    Returns:
+        {операция: {count, errors, error_rate, throughput, p50, p95, p99}},
+        включая итоговую строку ``total``
+    """
+    groups: Dict[str, List[Sample]] = {"total": samples}
+    for sample in samples:
+        groups.setdefault(sample.operation, []).append(sample)
+    
+    summary = {}
+    for name, group in groups.items():
+        latencies = sorted(s.latency for s in group)
+        errors = sum(1 for s in group if not s.ok)
+        summary[name] = {
+            "count": len(group),
+            "errors": errors,
+            "error_rate": errors / len(group) if group else 0.0,
+            "throughput": len(group) / duration if duration else 0.0,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+        }
+    return summary
+
+
+def timeline(samples: List[Sample], interval: float = 1.0) -> List[Tuple[float, int, int]]:
+    """Посчитать пропускную способность по интервалам времени.
+    
+    Args:
+        samples: Результаты операций
+        interval: Длина интервала в секундах
+    
+    Returns:
+        Список (начало интервала, операций, ошибок)
+    """
+    buckets: Dict[int, List[int]] = {}
+    for sample in samples:
+        bucket = buckets.setdefault(int(sample.started // interval), [0, 0])
+        bucket[0] += 1
+        bucket[1] += 0 if sample.ok else 1
+    return [(index * interval, ops, errors) for index, (ops, errors) in sorted(buckets.items())]
+
+
+def print_report(config: LoadConfig, samples: List[Sample]) -> None:
+    """Вывести отчет нагрузочного теста."""
+    print(f"Режим: {config.mode}, хранилище: {config.backend}, "
+          f"пользователей: {config.users}, длительность: {config.duration} с")
+    print(f"{'Операция':<22}{'кол-во':>9}{'ошибки':>9}{'оп/с':>10}"
+          f"{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}")
+    for name, stats in sorted(summarize(samples, config.duration).items(), key=lambda i: i[0] == "total"):
+        print(f"{name:<22}{stats['count']:>9}{stats['error_rate']:>9.1%}{stats['throughput']:>10.0f}"
+              f"{stats['p50'] * 1000:>10.3f}{stats['p95'] * 1000:>10.3f}{stats['p99'] * 1000:>10.3f}")
+    print("\nПропускная способность по секундам:")
+    for start, ops, errors in timeline(samples):
+        print(f"  {start:>6.0f} с: {ops:>8} оп., ошибок {errors}")
+
+
+def _parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = int(weight) if weight else 1
+    return mix
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа нагрузочного теста."""
+    parser = argparse.ArgumentParser(description="Нагрузочный тест сервисов")
+    parser.add_argument("--users", type=int, default=16, help="Количество виртуальных пользователей")
+    parser.add_argument("--duration", type=float, default=10.0, help="Длительность, с")
+    parser.add_argument("--mode", choices=MODES, default="thread")
+    parser.add_argument("--backend", choices=BACKENDS, default="memory")
+    parser.add_argument("--mix", type=_parse_mix, default=DEFAULT_MIX,
+                        help="Смесь операций, например create_task=3,get_tasks_by_user=1")
+    parser.add_argument("--seed-users", type=int, default=100)
+    parser.add_argument("--seed-projects", type=int, default=50)
+    parser.add_argument("--seed-tasks", type=int, default=5000)
+    parser.add_argument("--think-time", type=float, default=0.0, help="Средняя пауза между операциями, с")
+    parser.add_argument("--processes", type=int, default=None, help="Количество процессов в режиме process")
+    args = parser.parse_args(argv)
+    
+    config = LoadConfig(
+        users=args.users,
+        duration=args.duration,
+        mode=args.mode,
+        backend=args.backend,
+        mix=args.mix,
+        seed_users=args.seed_users,
+        seed_projects=args.seed_projects,
+        seed_tasks=args.seed_tasks,
+        think_time=args.think_time,
+        processes=args.processes,
+    )
+    print_report(config, run_load_test(config))
+
+
+if __name__ == "__main__":
+    main()
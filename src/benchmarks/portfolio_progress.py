@@ -0,0 +1,116 @@
+"""Бенчмарк расчета прогресса по портфелю проектов.
+
+Сравнивает последовательный цикл по ``ProjectService.get_project_progress``
+с ``ProjectService.get_portfolio_progress`` в текущем процессе
+(``max_workers=1``, пул не используется) и в пуле при разном числе процессов.
+
+Запуск:
+    python -m src.benchmarks.portfolio_progress --projects 2000 --tasks 200
+"""
+import argparse
+import os
+import random
+import time
+from typing import List, Optional
+from src.models.project import Project
+from src.models.task import Task, TaskStatus
+from src.repositories.project_repository import ProjectRepository
+from src.repositories.task_repository import TaskRepository
+from src.repositories.user_repository import UserRepository
+from src.services.project_service import ProjectService
+
+
+def build_service(projects: int, tasks_per_project: int, seed: int = 42) -> ProjectService:
+    """Создать сервис проектов с синтетическим портфелем.
+    
+    Args:
+        projects: Количество проектов
+        tasks_per_project: Количество задач в проекте
+        seed: Зерно генератора случайных чисел
+    
+    Returns:
+        Сервис проектов
+    """
+    rng = random.Random(seed)
+    statuses = list(TaskStatus)
+    project_repo = ProjectRepository()
+    task_repo = TaskRepository()
+    task_id = 1
+    for _ in range(projects):
+        project = Project(project_id=None, name="bench", description="", owner_id=1)
+        project_repo.add(project)
+        for _ in range(tasks_per_project):
+            task = Task(task_id, "bench", "", project.id)
+            task.status = rng.choice(statuses)
+            project.add_task(task)
+            task_repo.add(task)
+            task_id += 1
+    return ProjectService(project_repo, UserRepository(), task_repo=task_repo)
+
+
+def _measure(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(projects: int, tasks_per_project: int, workers: List[int], repeat: int) -> None:
+    """Выполнить бенчмарк и вывести таблицу результатов.
+    
+    Args:
+        projects: Количество проектов
+        tasks_per_project: Количество задач в проекте
+        workers: Варианты количества процессов пула (больше 1)
+        repeat: Количество повторов (берется лучшее время)
+    """
+    service = build_service(projects, tasks_per_project)
+    ids = [p.id for p in service.get_all_projects()]
+    
+    def serial_loop():
+        for project_id in ids:
+            service.get_project_progress(project_id)
+    
+    baseline = _measure(serial_loop, repeat)
+    print(f"Проектов: {projects}, задач в проекте: {tasks_per_project}, ядер: {os.cpu_count()}")
+    print(f"{'Вариант':<28}{'Время, с':>12}{'Ускорение':>12}")
+    print(f"{'get_project_progress (цикл)':<28}{baseline:>12.4f}{1.0:>12.2f}")
+    # max_workers=1: подсчет в текущем процессе, без пула
+    elapsed = _measure(lambda: service.get_portfolio_progress(max_workers=1), repeat)
+    print(f"{'portfolio, без пула':<28}{elapsed:>12.4f}{baseline / elapsed:>12.2f}")
+    for count in workers:
+        if count < 2:
+            continue
+        # Порог 0: пул используется при любом размере портфеля
+        elapsed = _measure(
+            lambda: service.get_portfolio_progress(max_workers=count, parallel_threshold=0),
+            repeat
+        )
+        label = f"portfolio, пул процессов={count}"
+        print(f"{label:<28}{elapsed:>12.4f}{baseline / elapsed:>12.2f}")
+    service.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Бенчмарк прогресса по портфелю проектов")
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="*", default=None,
+                        help="Варианты количества процессов пула (по умолчанию 2, 4, ... до числа ядер)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    
+    workers = args.workers
+    if not workers:
+        workers, count = [], 2
+        while count <= max(os.cpu_count() or 1, 2):
+            workers.append(count)
+            count *= 2
+    run(args.projects, args.tasks, workers, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
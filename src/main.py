@@ -1,11 +1,19 @@
 """Основной модуль приложения с CLI интерфейсом."""
+import os
+from typing import Dict, Iterable, List, Optional
 from src.models.task import TaskStatus, Priority
 from src.repositories.user_repository import UserRepository
 from src.repositories.project_repository import ProjectRepository
 from src.repositories.task_repository import TaskRepository
+from src.repositories.unit_of_work import UnitOfWork
 from src.services.user_service import UserService
-from src.services.project_service import ProjectService
+from src.services.project_service import ProjectProgress, ProjectService
 from src.services.task_service import TaskService
+from src.services.tracing import TraceRecorder
+from src.renderer import (
+    Column, ListingOptions, TableRenderer, TASK_COLUMNS,
+    parse_listing_options, pick_columns, project_columns, select_rows
+)
 
 
 class TaskManagerCLI:
@@ -160,8 +168,21 @@ class TaskManagerCLI:
             print("Проектов нет")
             return
         
-        for project in projects:
-            print(f"\n{project}")
+        progress: Dict[int, ProjectProgress] = {}
+        columns = project_columns(progress)
+        options = self._ask_listing_options(columns)
+        if options is None:
+            return
+        
+        # Прогресс считается заранее одним проходом: для всех проектов,
+        # если по нему сортируют, иначе только для выводимых
+        if options.sort == "progress":
+            progress.update(self.project_service.get_portfolio_progress())
+            rows = select_rows(projects, columns, options)
+        else:
+            rows = list(select_rows(projects, columns, options))
+            progress.update(self.project_service.get_portfolio_progress([p.id for p in rows]))
+        self._render(rows, columns, options)
     
     def handle_list_tasks(self):
         """Показать задачи проекта."""
@@ -175,8 +196,10 @@ class TaskManagerCLI:
                 print("Задач нет")
                 return
             
-            for task in tasks:
-                print(f"\n{task}")
+            options = self._ask_listing_options(TASK_COLUMNS)
+            if options is None:
+                return
+            self._render(select_rows(tasks, TASK_COLUMNS, options), TASK_COLUMNS, options)
         except Exception as e:
             print(f"✗ Ошибка: {e}")
     
@@ -191,6 +214,25 @@ class TaskManagerCLI:
         except ValueError as e:
             print(f"✗ Ошибка: {e}")
     
+    def _ask_listing_options(self, columns: List[Column]) -> Optional[ListingOptions]:
+        """Запросить параметры вывода списка."""
+        names = ",".join(column.name for column in columns)
+        text = input(
+            "Параметры (--limit N, --sort колонка [--desc], "
+            f"--columns {names}, --page-size N; Enter - по умолчанию): "
+        )
+        try:
+            return parse_listing_options(text, columns)
+        except ValueError as e:
+            print(f"✗ Ошибка: {e}")
+            return None
+    
+    def _render(self, rows: Iterable, columns: List[Column], options: ListingOptions) -> None:
+        """Вывести строки таблицей."""
+        renderer = TableRenderer(pick_columns(columns, options.columns), page_size=options.page_size)
+        count = renderer.render(rows)
+        print(f"Показано: {count}")
+    
     def _initialize_demo_data(self):
         """Инициализировать демонстрационные данные."""
         # Создание пользователей
@@ -249,15 +291,33 @@ def main():
     user_repo = UserRepository()
     project_repo = ProjectRepository()
     task_repo = TaskRepository()
+    uow = UnitOfWork(user_repo, project_repo, task_repo)
     
     # Инициализация сервисов
-    user_service = UserService(user_repo)
-    project_service = ProjectService(project_repo, user_repo)
-    task_service = TaskService(task_repo, project_repo, user_repo)
+    user_service = UserService(user_repo, uow)
+    project_service = ProjectService(project_repo, user_repo, uow, task_repo)
+    task_service = TaskService(task_repo, project_repo, user_repo, uow)
+    
+    # Пул процессов сервиса проектов останавливается при выходе (без записи в трассу)
+    pool_owner = project_service
+    
+    # Запись трассы вызовов сервисов (включается переменной окружения)
+    recorder = None
+    trace_path = os.environ.get("TASK_TRACE")
+    if trace_path:
+        recorder = TraceRecorder(trace_path)
+        user_service = recorder.wrap(user_service, "user")
+        project_service = recorder.wrap(project_service, "project")
+        task_service = recorder.wrap(task_service, "task")
     
     # Запуск CLI
     cli = TaskManagerCLI(project_service, task_service, user_service)
-    cli.run()
+    try:
+        cli.run()
+    finally:
+        pool_owner.close()
+        if recorder is not None:
+            recorder.close()
 
 
 if __name__ == "__main__":
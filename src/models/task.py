@@ -48,6 +48,8 @@ class Task:
         self.project_id = project_id
         self.assignee_id: Optional[int] = None
         self.created_at = datetime.now()
+        self.completed_at: Optional[datetime] = None
+        self.due_date: Optional[datetime] = None
     
     def assign_to(self, user_id: int) -> None:
         """Назначить задачу пользователю.
@@ -57,12 +59,24 @@ class Task:
         """
         self.assignee_id = user_id
     
+    def set_due_date(self, due_date: Optional[datetime]) -> None:
+        """Установить срок выполнения задачи.
+        
+        Args:
+            due_date: Срок или None, чтобы снять срок
+        """
+        self.due_date = due_date
+    
     def change_status(self, status: TaskStatus) -> None:
         """Изменить статус задачи.
         
         Args:
             status: Новый статус
         """
+        if status == TaskStatus.COMPLETED and self.status != TaskStatus.COMPLETED:
+            self.completed_at = datetime.now()
+        elif status != TaskStatus.COMPLETED:
+            self.completed_at = None
         self.status = status
     
     def __str__(self) -> str:
@@ -0,0 +1,265 @@
+"""Табличный вывод больших списков в CLI."""
+import argparse
+import heapq
+import shlex
+import sys
+from datetime import datetime
+from enum import Enum
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, TextIO
+from src.models.project import Project
+from src.models.task import Priority
+from src.services.project_service import ProjectProgress
+
+
+def _text(value: Any) -> str:
+    return "-" if value is None else str(value)
+
+
+def _enum_text(value: Optional[Enum]) -> str:
+    return "-" if value is None else str(value.value)
+
+
+def _float_text(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _datetime_text(value: Optional[datetime]) -> str:
+    return "-" if value is None else value.isoformat(" ", "minutes")
+
+
+class Column(NamedTuple):
+    """Колонка таблицы."""
+    name: str
+    header: str
+    width: int
+    value: Callable[[Any], Any]
+    align: str = "<"
+    key: Optional[Callable[[Any], Any]] = None  # Ключ сортировки, если отличается от значения
+    text: Callable[[Any], str] = _text  # Преобразование значения в текст
+
+
+class ListingOptions(NamedTuple):
+    """Параметры вывода списка."""
+    limit: Optional[int]
+    sort: Optional[str]
+    descending: bool
+    columns: Optional[List[str]]
+    page_size: Optional[int]
+
+
+class _OptionsParser(argparse.ArgumentParser):
+    """Парсер, сообщающий об ошибке исключением вместо завершения процесса."""
+    
+    def error(self, message: str) -> None:
+        raise ValueError(message)
+
+
+def _positive(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"ожидается положительное целое число: {text}")
+    return value
+
+
+def parse_listing_options(text: str, columns: List[Column]) -> ListingOptions:
+    """Разобрать строку параметров вывода.
+    
+    Поддерживаются ``--limit N``, ``--sort колонка`` с флагом ``--desc``
+    (по убыванию), ``--columns a,b,c`` и ``--page-size N``.
+    
+    Args:
+        text: Строка параметров (пустая - параметры по умолчанию)
+        columns: Доступные колонки
+    
+    Returns:
+        Параметры вывода
+    
+    Raises:
+        ValueError: Если параметры некорректны
+    """
+    parser = _OptionsParser(prog="", add_help=False)
+    parser.add_argument("--limit", type=_positive)
+    parser.add_argument("--sort")
+    parser.add_argument("--desc", action="store_true")
+    parser.add_argument("--columns")
+    parser.add_argument("--page-size", type=_positive)
+    args = parser.parse_args(shlex.split(text))
+    
+    names = {column.name for column in columns}
+    if args.sort is not None and args.sort not in names:
+        raise ValueError(f"Неизвестная колонка сортировки: {args.sort}")
+    
+    selected = None
+    if args.columns:
+        selected = [name.strip() for name in args.columns.split(",") if name.strip()]
+        unknown = [name for name in selected if name not in names]
+        if unknown:
+            raise ValueError(f"Неизвестные колонки: {', '.join(unknown)}")
+    
+    return ListingOptions(args.limit, args.sort, args.desc, selected, args.page_size)
+
+
+def select_rows(rows: Iterable[Any], columns: List[Column], options: ListingOptions) -> Iterable[Any]:
+    """Отобрать и упорядочить строки согласно параметрам.
+    
+    Сортировка с ограничением выполняется через ``heapq`` за
+    O(n log limit), ограничение без сортировки не просматривает
+    строки дальше ``limit``.
+    
+    Args:
+        rows: Строки (сущности)
+        columns: Доступные колонки
+        options: Параметры вывода
+    
+    Returns:
+        Отобранные строки
+    """
+    if not options.sort:
+        return rows if options.limit is None else islice(rows, options.limit)
+    
+    column = next(c for c in columns if c.name == options.sort)
+    get_key = column.key or column.value
+    descending = options.descending
+    
+    def key(row: Any) -> tuple:
+        # Пустые значения всегда в конце списка
+        value = get_key(row)
+        return (value is None) != descending, value
+    
+    if options.limit is not None:
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return select(options.limit, rows, key=key)
+    return sorted(rows, key=key, reverse=descending)
+
+
+class TableRenderer:
+    """Потоковый вывод строк в таблицу фиксированной ширины.
+    
+    Шаблон строки собирается один раз, значения форматируются только
+    для выводимых строк, а готовые строки накапливаются и записываются
+    в поток блоками по ``chunk_rows`` одним вызовом ``write``.
+    """
+    
+    def __init__(
+        self,
+        columns: List[Column],
+        out: Optional[TextIO] = None,
+        chunk_rows: int = 1000,
+        page_size: Optional[int] = None,
+        pager: Optional[Callable[[], bool]] = None
+    ):
+        """Инициализация вывода.
+        
+        Args:
+            columns: Выводимые колонки
+            out: Поток вывода (по умолчанию sys.stdout)
+            chunk_rows: Количество строк в одном блоке записи
+            page_size: Количество строк на странице (None - без постраничного вывода)
+            pager: Запрос перехода к следующей странице; False - прервать вывод
+        """
+        self.columns = columns
+        self.out = out or sys.stdout
+        self.chunk_rows = chunk_rows
+        self.page_size = page_size
+        self.pager = pager or _ask_next_page
+        fields = [f"{{:{c.align}{c.width}.{c.width}}}" for c in columns]
+        if columns and columns[-1].align == "<":
+            # Последняя колонка не дополняется пробелами до ширины
+            fields[-1] = f"{{:.{columns[-1].width}}}"
+        self._template = " ".join(fields) + "\n"
+        self._width = sum(c.width for c in columns) + len(columns) - 1
+        self._cells = [(column.value, column.text) for column in columns]
+    
+    def header(self) -> str:
+        """Строка заголовка с разделителем."""
+        line = self._template.format(*(column.header for column in self.columns))
+        return line + "-" * self._width + "\n"
+    
+    def format_row(self, row: Any) -> str:
+        """Отформатировать одну строку таблицы."""
+        return self._template.format(*[text(get(row)) for get, text in self._cells])
+    
+    def render(self, rows: Iterable[Any]) -> int:
+        """Вывести строки.
+        
+        Args:
+            rows: Строки (сущности)
+        
+        Returns:
+            Количество выведенных строк
+        """
+        write = self.out.write
+        buffer = [self.header()]
+        count = 0
+        for row in rows:
+            if self.page_size and count and count % self.page_size == 0:
+                # Страница выводится целиком перед запросом следующей
+                write("".join(buffer))
+                buffer = []
+                self.out.flush()
+                if not self.pager():
+                    break
+            buffer.append(self.format_row(row))
+            count += 1
+            if len(buffer) >= self.chunk_rows:
+                write("".join(buffer))
+                buffer = []
+        if buffer:
+            write("".join(buffer))
+        self.out.flush()
+        return count
+
+
+def _ask_next_page() -> bool:
+    return input("-- Enter - далее, q - выход --").strip().lower() != "q"
+
+
+def project_columns(progress: Dict[int, ProjectProgress]) -> List[Column]:
+    """Колонки списка проектов.
+    
+    Args:
+        progress: Заранее рассчитанный прогресс проектов
+    
+    Returns:
+        Список колонок
+    """
+    def get_progress(project: Project) -> Optional[float]:
+        entry = progress.get(project.id)
+        return None if entry is None else entry.progress
+    
+    return [
+        Column("id", "ID", 8, lambda p: p.id, ">"),
+        Column("name", "Название", 32, lambda p: p.name),
+        Column("status", "Статус", 10, lambda p: p.status),
+        Column("owner", "Владелец", 8, lambda p: p.owner_id, ">"),
+        Column("tasks", "Задач", 7, lambda p: len(p.tasks), ">"),
+        Column("progress", "Прогресс", 8, get_progress, ">", text=_float_text),
+    ]
+
+
+_PRIORITY_ORDER = {priority: order for order, priority in enumerate(Priority)}
+
+TASK_COLUMNS: List[Column] = [
+    Column("id", "ID", 8, lambda t: t.id, ">"),
+    Column("title", "Заголовок", 32, lambda t: t.title),
+    Column("status", "Статус", 12, lambda t: t.status, key=lambda t: t.status.value, text=_enum_text),
+    Column(
+        "priority", "Приоритет", 9, lambda t: t.priority,
+        key=lambda t: _PRIORITY_ORDER[t.priority], text=_enum_text
+    ),
+    Column("assignee", "Исполн.", 8, lambda t: t.assignee_id, ">"),
+    Column("created", "Создана", 16, lambda t: t.created_at, text=_datetime_text),
+    Column("due", "Срок", 16, lambda t: t.due_date, text=_datetime_text),
+]
+
+
+def pick_columns(columns: List[Column], names: Optional[List[str]]) -> List[Column]:
+    """Выбрать колонки по именам (None - все колонки)."""
+    if names is None:
+        return columns
+    by_name = {column.name: column for column in columns}
+    return [by_name[name] for name in names]
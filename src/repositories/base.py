@@ -1,6 +1,7 @@
 """Базовый репозиторий с общим интерфейсом."""
 from abc import ABC, abstractmethod
-from typing import List, Optional, TypeVar, Generic, Dict
+from typing import Callable, Iterable, List, Optional, TypeVar, Generic, Dict
+from .id_allocator import IIdAllocator, SequentialIdAllocator
 
 T = TypeVar('T')
 
@@ -35,40 +36,123 @@ class IRepository(ABC, Generic[T]):
 
 
 class InMemoryRepository(IRepository[T]):
-    """Реализация репозитория с хранением в памяти."""
+    """Реализация репозитория с хранением в памяти.
     
-    def __init__(self):
+    Если к репозиторию подключена единица работы (см. ``UnitOfWork``),
+    все изменения регистрируются в ней и фиксируются одним пакетом
+    через ``commit_batch``. Все сущности, которые репозиторий отдает
+    наружу (``get_by_id``, ``get_all``, ``find_*``), запоминаются в ней
+    до первого изменения, чтобы их можно было откатить.
+    """
+    
+    def __init__(self, id_allocator: Optional[IIdAllocator] = None):
+        """Инициализация репозитория.
+        
+        Args:
+            id_allocator: Генератор ID для новых сущностей
+                (по умолчанию последовательный счетчик процесса)
+        """
         self._storage: Dict[int, T] = {}
-        self._next_id = 1
+        self._id_allocator = id_allocator or SequentialIdAllocator()
+        self._uow = None  # Активная единица работы
+        self._listeners: List[Callable[[int, Optional[T]], None]] = []
+    
+    def __getstate__(self) -> dict:
+        # Подписчики не сохраняются вместе с хранилищем (снимки, pickle)
+        state = self.__dict__.copy()
+        state["_listeners"] = []
+        return state
     
     def add(self, entity: T) -> None:
         """Добавить сущность в хранилище."""
         if hasattr(entity, 'id'):
-            if entity.id is None:
-                entity.id = self._next_id
-                self._next_id += 1
-            self._storage[entity.id] = entity
+            allocated = entity.id is None
+            if allocated:
+                entity.id = self._id_allocator.next_id()
+            self._insert(entity)
+            if self._uow is not None:
+                self._uow.register_new(self, entity, allocated)
         else:
             raise ValueError("Entity must have 'id' attribute")
     
     def get_by_id(self, entity_id: int) -> Optional[T]:
         """Получить сущность по ID."""
-        return self._storage.get(entity_id)
+        entity = self._storage.get(entity_id)
+        if entity is not None and self._uow is not None:
+            self._uow.register_clean(self, entity)
+        return entity
     
     def get_all(self) -> List[T]:
         """Получить все сущности."""
-        return list(self._storage.values())
+        return self._track(list(self._entities()))
     
     def update(self, entity: T) -> None:
         """Обновить сущность."""
         if hasattr(entity, 'id') and entity.id in self._storage:
-            self._storage[entity.id] = entity
+            self._insert(entity)
+            if self._uow is not None:
+                self._uow.register_dirty(self, entity)
         else:
             raise ValueError(f"Entity with id {entity.id if hasattr(entity, 'id') else 'unknown'} not found")
     
     def delete(self, entity_id: int) -> None:
         """Удалить сущность."""
         if entity_id in self._storage:
-            del self._storage[entity_id]
+            entity = self._remove(entity_id)
+            if self._uow is not None:
+                self._uow.register_deleted(self, entity)
         else:
             raise ValueError(f"Entity with id {entity_id} not found")
+    
+    def subscribe(self, listener: Callable[[int, Optional[T]], None]) -> None:
+        """Подписаться на изменения хранилища.
+        
+        Подписчик вызывается после каждого добавления, изменения и
+        удаления сущности, в том числе при откате единицы работы.
+        
+        Args:
+            listener: Функция (ID сущности, сущность или None при удалении)
+        """
+        self._listeners.append(listener)
+    
+    def commit_batch(self, new: List[T], dirty: List[T], deleted: List[T]) -> None:
+        """Зафиксировать пакет изменений одной операцией.
+        
+        Хранилище в памяти уже содержит все изменения, поэтому здесь
+        ничего не делается. Персистентные наследники переопределяют метод,
+        чтобы записать пакет за одно обращение к хранилищу.
+        
+        Args:
+            new: Добавленные сущности
+            dirty: Измененные сущности
+            deleted: Удаленные сущности
+        """
+        pass
+    
+    def _entities(self) -> Iterable[T]:
+        """Все сущности без регистрации в единице работы (для поиска)."""
+        return self._storage.values()
+    
+    def _track(self, entities: List[T]) -> List[T]:
+        """Запомнить отдаваемые сущности в активной единице работы."""
+        if self._uow is not None:
+            for entity in entities:
+                self._uow.register_clean(self, entity)
+        return entities
+    
+    def _insert(self, entity: T) -> None:
+        """Положить сущность в хранилище без учета единицы работы."""
+        self._storage[entity.id] = entity
+        for listener in self._listeners:
+            listener(entity.id, entity)
+    
+    def _remove(self, entity_id: int) -> T:
+        """Убрать сущность из хранилища без учета единицы работы."""
+        entity = self._storage.pop(entity_id)
+        for listener in self._listeners:
+            listener(entity_id, None)
+        return entity
+    
+    def _release_id(self, entity_id: int) -> None:
+        """Вернуть генератору ID, выданный при откатываемом добавлении."""
+        self._id_allocator.release(entity_id)
@@ -0,0 +1,219 @@
+"""Стратегии выдачи идентификаторов сущностей."""
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class IIdAllocator(ABC):
+    """Абстрактный генератор идентификаторов."""
+    
+    @abstractmethod
+    def next_id(self) -> int:
+        """Выдать новый идентификатор."""
+        pass
+    
+    def release(self, value: int) -> None:
+        """Вернуть последний выданный ID (например, при откате добавления).
+        
+        По умолчанию ID не переиспользуются; образовавшиеся пропуски
+        в нумерации допустимы.
+        
+        Args:
+            value: Выданный ранее ID
+        """
+        pass
+    
+    def __getstate__(self) -> dict:
+        # Блокировка не сериализуется (снимки хранилища, pickle)
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class SequentialIdAllocator(IIdAllocator):
+    """Последовательные ID в пределах одного процесса (начиная с 1).
+    
+    Счетчик сбрасывается при перезапуске, поэтому подходит только для
+    единственного писателя и хранения в памяти.
+    """
+    
+    def __init__(self, start: int = 1):
+        self._next = start
+        self._lock = threading.Lock()
+    
+    def next_id(self) -> int:
+        """Выдать следующий ID."""
+        with self._lock:
+            value = self._next
+            self._next += 1
+            return value
+    
+    def release(self, value: int) -> None:
+        """Вернуть ID, если он был выдан последним."""
+        with self._lock:
+            if value == self._next - 1:
+                self._next = value
+
+
+@contextmanager
+def _locked_file(path: str) -> Iterator[BinaryIO]:
+    """Открыть файл с монопольной межпроцессной блокировкой."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield f
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class BlockLeaseIdAllocator(IIdAllocator):
+    """Выдача ID блоками, арендуемыми у общего файла-распределителя.
+    
+    Каждый писатель (процесс или узел) под межпроцессной блокировкой
+    забирает из файла диапазон из ``block_size`` идентификаторов и
+    дальше выдает их локально без координации. Диапазоны не пересекаются,
+    поэтому ID не повторяются ни между писателями, ни после перезапуска;
+    неиспользованный остаток блока при перезапуске теряется. Копия,
+    восстановленная из pickle (например, из снимка хранилища), не
+    наследует текущий блок и арендует новый.
+    """
+    
+    def __init__(self, lease_path: str, block_size: int = 1000):
+        """Инициализация распределителя.
+        
+        Args:
+            lease_path: Путь к файлу со следующим свободным ID
+            block_size: Размер арендуемого блока
+        
+        Raises:
+            ValueError: Если размер блока не положителен
+        """
+        if block_size <= 0:
+            raise ValueError("Размер блока должен быть положительным")
+        self.lease_path = lease_path
+        self.block_size = block_size
+        self.leases = 0
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+    
+    def next_id(self) -> int:
+        """Выдать следующий ID из арендованного блока."""
+        with self._lock:
+            if self._next >= self._end:
+                self._next, self._end = self._lease()
+            value = self._next
+            self._next += 1
+            return value
+    
+    def __getstate__(self) -> dict:
+        # Остаток блока принадлежит исходному объекту, иначе копия повторит его ID
+        state = super().__getstate__()
+        state["_next"] = state["_end"]
+        return state
+    
+    def release(self, value: int) -> None:
+        """Вернуть ID в текущий блок, если он был выдан последним."""
+        with self._lock:
+            if value == self._next - 1 and self._next <= self._end:
+                self._next = value
+    
+    def _lease(self) -> Tuple[int, int]:
+        with _locked_file(self.lease_path) as f:
+            f.seek(0)
+            content = f.read().strip()
+            start = int(content) if content else 1
+            end = start + self.block_size
+            f.seek(0)
+            f.truncate()
+            f.write(str(end).encode("ascii"))
+            f.flush()
+            os.fsync(f.fileno())
+        self.leases += 1
+        return start, end
+
+
+class TimeOrderedIdAllocator(IIdAllocator):
+    """64-битные ID, упорядоченные по времени создания.
+    
+    Структура ID (старшие биты слева): 41 бит - миллисекунды от
+    ``epoch_ms``, 10 бит - номер узла, 12 бит - порядковый номер внутри
+    миллисекунды. Уникальность между писателями обеспечивается разными
+    номерами узлов, координация при выдаче не нужна.
+    """
+    
+    NODE_BITS = 10
+    SEQUENCE_BITS = 12
+    MAX_NODE_ID = (1 << NODE_BITS) - 1
+    _SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+    
+    # 2024-01-01T00:00:00Z
+    DEFAULT_EPOCH_MS = 1704067200000
+    
+    def __init__(self, node_id: int, epoch_ms: int = DEFAULT_EPOCH_MS):
+        """Инициализация генератора.
+        
+        Args:
+            node_id: Номер узла (0..1023), уникальный для каждого писателя
+            epoch_ms: Начало отсчета времени в миллисекундах Unix
+        
+        Raises:
+            ValueError: Если номер узла вне допустимого диапазона
+        """
+        if not 0 <= node_id <= self.MAX_NODE_ID:
+            raise ValueError(f"Номер узла должен быть от 0 до {self.MAX_NODE_ID}")
+        self.node_id = node_id
+        self.epoch_ms = epoch_ms
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+    
+    def next_id(self) -> int:
+        """Выдать следующий ID."""
+        with self._lock:
+            now = self._now_ms()
+            # При переводе часов назад продолжаем от последней метки
+            if now <= self._last_ms:
+                now = self._last_ms
+                self._sequence = (self._sequence + 1) & self._SEQUENCE_MASK
+                if self._sequence == 0:
+                    now = self._wait_next_ms(self._last_ms)
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return (
+                (now << (self.NODE_BITS + self.SEQUENCE_BITS))
+                | (self.node_id << self.SEQUENCE_BITS)
+                | self._sequence
+            )
+    
+    def _now_ms(self) -> int:
+        return time.time_ns() // 1_000_000 - self.epoch_ms
+    
+    def _wait_next_ms(self, last_ms: int) -> int:
+        now = self._now_ms()
+        while now <= last_ms:
+            time.sleep(0.0001)
+            now = self._now_ms()
+        return now
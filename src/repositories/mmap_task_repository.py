@@ -0,0 +1,508 @@
+"""Файловый репозиторий задач с записями фиксированного размера и mmap."""
+import math
+import mmap
+import os
+import struct
+import weakref
+from bisect import bisect_left
+from functools import lru_cache
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .base import IRepository
+from src.models.task import Task, TaskStatus, Priority
+
+_MAGIC = b"TASKREC2"
+_HEADER = struct.Struct("<8sQQQ32x")  # magic, count, capacity, flags
+_RECORD = struct.Struct("<qqqBBBxdddQIQI4x")
+
+# Смещения полей внутри записи (для выборки отдельных колонок)
+_FIELDS: Dict[str, Tuple[int, str]] = {
+    "id": (0, "q"),
+    "project_id": (8, "q"),
+    "assignee_id": (16, "q"),
+    "status": (24, "B"),
+    "priority": (25, "B"),
+    "live": (26, "B"),
+    "created_at": (28, "d"),
+    "completed_at": (36, "d"),
+    "due_date": (44, "d"),
+}
+
+_SORTED_FLAG = 1  # Записи упорядочены по created_at
+_NO_ASSIGNEE = -1
+_INITIAL_CAPACITY = 1024
+
+_STATUSES = list(TaskStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_PRIORITIES = list(Priority)
+_PRIORITY_CODES = {priority: code for code, priority in enumerate(_PRIORITIES)}
+
+
+@lru_cache(maxsize=None)
+def _column_struct(*fields: str) -> Tuple[struct.Struct, Tuple[int, ...]]:
+    """Построить формат, извлекающий из записи только указанные поля.
+    
+    Returns:
+        Формат и позиции запрошенных полей в распакованном кортеже
+    """
+    layout = sorted(fields, key=lambda name: _FIELDS[name][0])
+    fmt, position = "<", 0
+    for name in layout:
+        offset, code = _FIELDS[name]
+        fmt += f"{offset - position}x{code}" if offset > position else code
+        position = offset + struct.calcsize("<" + code)
+    fmt += f"{_RECORD.size - position}x"
+    return struct.Struct(fmt), tuple(layout.index(name) for name in fields)
+
+
+class MmapTaskRepository(IRepository[Task]):
+    """Репозиторий задач, хранящий данные в файле, отображенном через mmap.
+    
+    Файл задач содержит заголовок и записи фиксированного размера
+    (id, project_id, assignee_id, коды статуса и приоритета, created_at,
+    completed_at, due_date, ссылки на строки). Заголовки и описания лежат в
+    отдельной куче строк ``<path>.heap``. ID задачи совпадает с номером
+    записи, поэтому ``get_by_id`` сводится к вычислению смещения, а
+    фильтры читают нужные колонки прямо из страничного кэша, создавая
+    объекты только для найденных задач.
+    
+    Открытие файла не требует чтения записей, поэтому запуск не зависит
+    от количества задач. Писатель должен быть один; любое число процессов
+    может открыть тот же файл с ``readonly=True`` и разделять отображение.
+    """
+    
+    def __init__(self, path: str, readonly: bool = False):
+        """Открыть или создать хранилище задач.
+        
+        Args:
+            path: Путь к файлу записей
+            readonly: Открыть только для чтения
+        
+        Raises:
+            ValueError: Если файл не является хранилищем задач
+        """
+        self.path = path
+        self.heap_path = path + ".heap"
+        self.readonly = readonly
+        self._uow = None
+        self._listeners: List[Callable[[int, Optional[Task]], None]] = []
+        self._identity: "weakref.WeakValueDictionary[int, Task]" = weakref.WeakValueDictionary()
+        
+        if not readonly and not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, 0, _INITIAL_CAPACITY, _SORTED_FLAG))
+                f.truncate(_HEADER.size + _INITIAL_CAPACITY * _RECORD.size)
+            open(self.heap_path, "ab").close()
+        
+        self._file = open(path, "rb" if readonly else "r+b")
+        # Куча пишется без буфера, чтобы строки сразу были видны читателям
+        self._heap_file = None if readonly else open(self.heap_path, "ab", buffering=0)
+        self._heap_reader = open(self.heap_path, "rb")
+        self._mm: Optional[mmap.mmap] = None
+        self._heap_mm: Optional[mmap.mmap] = None
+        self._map()
+        
+        magic, _, _, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"Файл {path} не является хранилищем задач")
+    
+    # --- Управление отображением -----------------------------------------
+    
+    def _map(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        access = mmap.ACCESS_READ if self.readonly else mmap.ACCESS_WRITE
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+    
+    def _header(self) -> Tuple[int, int, int]:
+        _, count, capacity, flags = _HEADER.unpack_from(self._mm, 0)
+        return count, capacity, flags
+    
+    def _write_header(self, count: int, capacity: int, flags: int) -> None:
+        _HEADER.pack_into(self._mm, 0, _MAGIC, count, capacity, flags)
+    
+    def _count(self) -> int:
+        """Количество записей; при росте файла другим процессом отображение обновляется."""
+        count, capacity, _ = self._header()
+        if _HEADER.size + capacity * _RECORD.size > len(self._mm):
+            self._map()
+        return count
+    
+    def _ensure_capacity(self, count: int) -> None:
+        _, capacity, flags = self._header()
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        self._mm.flush()
+        self._file.truncate(_HEADER.size + capacity * _RECORD.size)
+        self._map()
+        _, old_count, _, _ = _HEADER.unpack_from(self._mm, 0)
+        self._write_header(old_count, capacity, flags)
+    
+    def _read_string(self, offset: int, length: int) -> str:
+        if length == 0:
+            return ""
+        if self._heap_mm is None or offset + length > len(self._heap_mm):
+            if self._heap_mm is not None:
+                self._heap_mm.close()
+            self._heap_mm = mmap.mmap(self._heap_reader.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._heap_mm[offset:offset + length].decode("utf-8")
+    
+    def _write_string(self, value: str) -> Tuple[int, int]:
+        data = value.encode("utf-8")
+        offset = self._heap_file.tell()
+        self._heap_file.write(data)
+        return offset, len(data)
+    
+    def _check_writable(self) -> None:
+        if self.readonly:
+            raise ValueError("Хранилище открыто только для чтения")
+    
+    # --- Кодирование записей ---------------------------------------------
+    
+    def _record_offset(self, entity_id: int) -> int:
+        return _HEADER.size + (entity_id - 1) * _RECORD.size
+    
+    def _is_live(self, entity_id: int) -> bool:
+        if entity_id is None or entity_id < 1 or entity_id > self._count():
+            return False
+        return self._mm[self._record_offset(entity_id) + _FIELDS["live"][0]] == 1
+    
+    def _encode(self, task: Task) -> None:
+        offset = self._record_offset(task.id)
+        title, description = (0, 0), (0, 0)
+        if self._mm[offset + _FIELDS["live"][0]] == 1:
+            # Неизмененные строки не дописываются в кучу повторно
+            *_, t_off, t_len, d_off, d_len = _RECORD.unpack_from(self._mm, offset)
+            if self._read_string(t_off, t_len) == task.title:
+                title = (t_off, t_len)
+            if self._read_string(d_off, d_len) == task.description:
+                description = (d_off, d_len)
+        if title == (0, 0) and task.title:
+            title = self._write_string(task.title)
+        if description == (0, 0) and task.description:
+            description = self._write_string(task.description)
+        
+        _RECORD.pack_into(
+            self._mm, offset,
+            task.id,
+            task.project_id,
+            _NO_ASSIGNEE if task.assignee_id is None else task.assignee_id,
+            _STATUS_CODES[task.status],
+            _PRIORITY_CODES[task.priority],
+            1,
+            task.created_at.timestamp(),
+            math.nan if task.completed_at is None else task.completed_at.timestamp(),
+            math.nan if task.due_date is None else task.due_date.timestamp(),
+            title[0], title[1],
+            description[0], description[1]
+        )
+    
+    def _decode(self, entity_id: int) -> Task:
+        (task_id, project_id, assignee_id, status, priority, _,
+         created_at, completed_at, due_date, t_off, t_len, d_off, d_len) = _RECORD.unpack_from(
+            self._mm, self._record_offset(entity_id))
+        task = Task(
+            task_id=task_id,
+            title=self._read_string(t_off, t_len),
+            description=self._read_string(d_off, d_len),
+            project_id=project_id,
+            priority=_PRIORITIES[priority]
+        )
+        task.status = _STATUSES[status]
+        task.assignee_id = None if assignee_id == _NO_ASSIGNEE else assignee_id
+        task.created_at = datetime.fromtimestamp(created_at)
+        task.completed_at = None if math.isnan(completed_at) else datetime.fromtimestamp(completed_at)
+        task.due_date = None if math.isnan(due_date) else datetime.fromtimestamp(due_date)
+        return task
+    
+    def _track(self, tasks: List[Task]) -> List[Task]:
+        """Запомнить отдаваемые задачи в активной единице работы."""
+        if self._uow is not None:
+            for task in tasks:
+                self._uow.register_clean(self, task)
+        return tasks
+    
+    def _materialize(self, entity_id: int) -> Task:
+        # Читатели не кэшируют объекты: запись может изменить процесс-писатель
+        if self.readonly:
+            return self._decode(entity_id)
+        task = self._identity.get(entity_id)
+        if task is None:
+            task = self._decode(entity_id)
+            self._identity[entity_id] = task
+        return task
+    
+    def _scan(self, *fields: str) -> Iterator[Tuple[int, tuple]]:
+        """Перебрать живые записи, читая только указанные колонки.
+        
+        Yields:
+            Пары (ID задачи, значения колонок)
+        """
+        count = self._count()
+        column, order = _column_struct("live", *fields)
+        live, rest = order[0], order[1:]
+        view = memoryview(self._mm)[_HEADER.size:_HEADER.size + count * _RECORD.size]
+        try:
+            for index, values in enumerate(column.iter_unpack(view)):
+                if values[live] == 1:
+                    yield index + 1, tuple(values[i] for i in rest)
+        finally:
+            view.release()
+    
+    # --- IRepository -----------------------------------------------------
+    
+    def add(self, entity: Task) -> None:
+        """Добавить задачу в хранилище."""
+        self._check_writable()
+        if not hasattr(entity, 'id'):
+            raise ValueError("Entity must have 'id' attribute")
+        allocated = entity.id is None
+        if allocated:
+            entity.id = self._count() + 1
+        self._insert(entity)
+        if self._uow is not None:
+            self._uow.register_new(self, entity, allocated)
+    
+    def get_by_id(self, entity_id: int) -> Optional[Task]:
+        """Получить задачу по ID."""
+        if not self._is_live(entity_id):
+            return None
+        task = self._materialize(entity_id)
+        if self._uow is not None:
+            self._uow.register_clean(self, task)
+        return task
+    
+    def get_all(self) -> List[Task]:
+        """Получить все задачи."""
+        return self._track([self._materialize(task_id) for task_id, _ in self._scan()])
+    
+    def update(self, entity: Task) -> None:
+        """Обновить задачу."""
+        self._check_writable()
+        if not self._is_live(getattr(entity, 'id', None)):
+            raise ValueError(f"Entity with id {getattr(entity, 'id', 'unknown')} not found")
+        self._insert(entity)
+        if self._uow is not None:
+            self._uow.register_dirty(self, entity)
+    
+    def delete(self, entity_id: int) -> None:
+        """Удалить задачу."""
+        self._check_writable()
+        if not self._is_live(entity_id):
+            raise ValueError(f"Entity with id {entity_id} not found")
+        entity = self._remove(entity_id)
+        if self._uow is not None:
+            self._uow.register_deleted(self, entity)
+    
+    def subscribe(self, listener: Callable[[int, Optional[Task]], None]) -> None:
+        """Подписаться на изменения хранилища (изменения других процессов не сообщаются).
+        
+        Args:
+            listener: Функция (ID задачи, задача или None при удалении)
+        """
+        self._listeners.append(listener)
+    
+    def commit_batch(self, new: List[Task], dirty: List[Task], deleted: List[Task]) -> None:
+        """Сбросить пакет изменений на диск одной синхронизацией."""
+        self.flush()
+    
+    def _insert(self, entity: Task) -> None:
+        count, _, flags = self._header()
+        if entity.id < 1:
+            raise ValueError(f"Некорректный ID задачи: {entity.id}")
+        if entity.id > count:
+            self._ensure_capacity(entity.id)
+            count, capacity, flags = self._header()
+            if entity.id > count + 1:
+                flags &= ~_SORTED_FLAG  # Пропуски в нумерации нарушают порядок
+            elif count and flags & _SORTED_FLAG:
+                if entity.created_at.timestamp() < self._created_at(count):
+                    flags &= ~_SORTED_FLAG
+            self._encode(entity)
+            # Счетчик публикуется после записи, чтобы читатели не увидели неполную запись
+            self._write_header(entity.id, capacity, flags)
+        else:
+            if flags & _SORTED_FLAG and (
+                not self._is_live(entity.id)
+                or self._created_at(entity.id) != entity.created_at.timestamp()
+            ):
+                # Заполнение пропуска или смена времени создания нарушают порядок
+                self._write_header(count, self._header()[1], flags & ~_SORTED_FLAG)
+            self._encode(entity)
+        self._identity[entity.id] = entity
+        for listener in self._listeners:
+            listener(entity.id, entity)
+    
+    def _remove(self, entity_id: int) -> Task:
+        entity = self._materialize(entity_id)
+        self._mm[self._record_offset(entity_id) + _FIELDS["live"][0]] = 0
+        self._identity.pop(entity_id, None)
+        for listener in self._listeners:
+            listener(entity_id, None)
+        return entity
+    
+    def _created_at(self, entity_id: int) -> float:
+        return _column_struct("created_at")[0].unpack_from(self._mm, self._record_offset(entity_id))[0]
+    
+    def _release_id(self, entity_id: int) -> None:
+        # Последняя запись освобождается, остальные остаются пропусками
+        count, capacity, flags = self._header()
+        if entity_id == count:
+            self._write_header(count - 1, capacity, flags)
+    
+    # --- Поиск -----------------------------------------------------------
+    
+    def find_by_project(self, project_id: int) -> List[Task]:
+        """Найти задачи по проекту.
+        
+        Args:
+            project_id: ID проекта
+        
+        Returns:
+            Список задач
+        """
+        return self._track([
+            self._materialize(i) for i, (pid,) in self._scan("project_id") if pid == project_id
+        ])
+    
+    def find_by_assignee(self, assignee_id: int) -> List[Task]:
+        """Найти задачи по исполнителю.
+        
+        Args:
+            assignee_id: ID исполнителя
+        
+        Returns:
+            Список задач
+        """
+        return self._track([
+            self._materialize(i) for i, (aid,) in self._scan("assignee_id") if aid == assignee_id
+        ])
+    
+    def find_by_status(self, status: TaskStatus) -> List[Task]:
+        """Найти задачи по статусу.
+        
+        Args:
+            status: Статус задачи
+        
+        Returns:
+            Список задач
+        """
+        code = _STATUS_CODES[status]
+        return self._track([self._materialize(i) for i, (s,) in self._scan("status") if s == code])
+    
+    def find_open_with_due_date(self) -> List[Task]:
+        """Найти незавершенные задачи, у которых установлен срок.
+        
+        Колонки читаются без создания объектов, объекты создаются
+        только для найденных задач.
+        
+        Returns:
+            Список задач
+        """
+        completed = _STATUS_CODES[TaskStatus.COMPLETED]
+        return self._track([
+            self._materialize(i) for i, (due, s) in self._scan("due_date", "status")
+            if not math.isnan(due) and s != completed
+        ])
+    
+    def find_created_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Task]:
+        """Найти задачи, созданные в полуинтервале [start, end).
+        
+        Если записи упорядочены по времени создания, границы ищутся
+        бинарным поиском, иначе колонка created_at просматривается целиком.
+        
+        Args:
+            start: Начало интервала (None - без ограничения)
+            end: Конец интервала, не включается (None - без ограничения)
+        
+        Returns:
+            Список задач в порядке создания
+        """
+        lo = float("-inf") if start is None else start.timestamp()
+        hi = float("inf") if end is None else end.timestamp()
+        count = self._count()
+        flags = self._header()[2]
+        if flags & _SORTED_FLAG:
+            column = _CreatedAtColumn(self._mm, count)
+            first, last = bisect_left(column, lo), bisect_left(column, hi)
+            return self._track([
+                self._materialize(i + 1) for i in range(first, last) if self._is_live(i + 1)
+            ])
+        found = [(ts, i) for i, (ts,) in self._scan("created_at") if lo <= ts < hi]
+        return self._track([self._materialize(i) for _, i in sorted(found)])
+    
+    def find_latest(self, count: int) -> List[Task]:
+        """Найти последние созданные задачи.
+        
+        Args:
+            count: Количество задач
+        
+        Returns:
+            Список задач, от самой новой к самой старой
+        """
+        if count <= 0:
+            return []
+        total = self._count()
+        flags = self._header()[2]
+        if flags & _SORTED_FLAG:
+            result = []
+            for task_id in range(total, 0, -1):
+                if self._is_live(task_id):
+                    result.append(self._materialize(task_id))
+                    if len(result) == count:
+                        break
+            return self._track(result)
+        found = sorted(((ts, i) for i, (ts,) in self._scan("created_at")), reverse=True)
+        return self._track([self._materialize(i) for _, i in found[:count]])
+    
+    # --- Жизненный цикл --------------------------------------------------
+    
+    def flush(self) -> None:
+        """Синхронизировать отображение и кучу строк с диском."""
+        if self.readonly:
+            return
+        os.fsync(self._heap_file.fileno())
+        self._mm.flush()
+    
+    def close(self) -> None:
+        """Закрыть хранилище."""
+        if not self.readonly and self._mm is not None:
+            self.flush()
+        for handle in (self._mm, self._heap_mm):
+            if handle is not None:
+                handle.close()
+        self._mm = self._heap_mm = None
+        self._file.close()
+        self._heap_reader.close()
+        if self._heap_file is not None:
+            self._heap_file.close()
+    
+    def __enter__(self) -> "MmapTaskRepository":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+
+class _CreatedAtColumn:
+    """Последовательность значений created_at для бинарного поиска по файлу."""
+    
+    _column = _column_struct("created_at")[0]
+    
+    def __init__(self, mm: mmap.mmap, count: int):
+        self._mm = mm
+        self._count = count
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int) -> float:
+        return self._column.unpack_from(self._mm, _HEADER.size + index * _RECORD.size)[0]
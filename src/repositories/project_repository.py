@@ -1,10 +1,10 @@
 """Репозиторий для работы с проектами."""
 from typing import List
-from .base import InMemoryRepository
+from .time_index import TimeIndexedRepository
 from src.models.project import Project
 
 
-class ProjectRepository(InMemoryRepository[Project]):
+class ProjectRepository(TimeIndexedRepository[Project]):
     """Репозиторий проектов с дополнительными методами."""
     
     def find_by_owner(self, owner_id: int) -> List[Project]:
@@ -16,4 +16,4 @@ class ProjectRepository(InMemoryRepository[Project]):
         Returns:
             Список проектов
         """
-        return [p for p in self.get_all() if p.owner_id == owner_id]
+        return self._track([p for p in self._entities() if p.owner_id == owner_id])
@@ -1,10 +1,10 @@
 """Репозиторий для работы с задачами."""
 from typing import List
-from .base import InMemoryRepository
+from .time_index import TimeIndexedRepository
 from src.models.task import Task, TaskStatus
 
 
-class TaskRepository(InMemoryRepository[Task]):
+class TaskRepository(TimeIndexedRepository[Task]):
     """Репозиторий задач с дополнительными методами."""
     
     def find_by_project(self, project_id: int) -> List[Task]:
@@ -16,7 +16,7 @@ class TaskRepository(InMemoryRepository[Task]):
         Returns:
             Список задач
         """
-        return [t for t in self.get_all() if t.project_id == project_id]
+        return self._track([t for t in self._entities() if t.project_id == project_id])
     
     def find_by_assignee(self, assignee_id: int) -> List[Task]:
         """Найти задачи по исполнителю.
@@ -27,7 +27,7 @@ class TaskRepository(InMemoryRepository[Task]):
         Returns:
             Список задач
         """
-        return [t for t in self.get_all() if t.assignee_id == assignee_id]
+        return self._track([t for t in self._entities() if t.assignee_id == assignee_id])
     
     def find_by_status(self, status: TaskStatus) -> List[Task]:
         """Найти задачи по статусу.
@@ -38,4 +38,15 @@ class TaskRepository(InMemoryRepository[Task]):
         Returns:
             Список задач
         """
-        return [t for t in self.get_all() if t.status == status]
+        return self._track([t for t in self._entities() if t.status == status])
+    
+    def find_open_with_due_date(self) -> List[Task]:
+        """Найти незавершенные задачи, у которых установлен срок.
+        
+        Returns:
+            Список задач
+        """
+        return self._track([
+            t for t in self._entities()
+            if t.due_date is not None and t.status != TaskStatus.COMPLETED
+        ])
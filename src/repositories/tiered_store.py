@@ -0,0 +1,380 @@
+"""Многоуровневое хранилище: холодные проекты вытесняются на диск."""
+import os
+import pickle
+import struct
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from src.models.project import Project
+from src.models.task import Task, TaskStatus
+from .id_allocator import IIdAllocator
+from .project_repository import ProjectRepository
+from .task_repository import TaskRepository
+
+_LENGTH = struct.Struct("<I")
+_MIN_COMPACT_BYTES = 1 << 20
+
+
+class _ColdTask(NamedTuple):
+    """Сводка выгруженной задачи для поиска без чтения сегмента."""
+    project_id: int
+    assignee_id: Optional[int]
+    status: TaskStatus
+
+
+class TieredStore:
+    """Хранилище проектов и задач с ограниченным объемом памяти.
+    
+    Горячие проекты и их задачи хранятся в памяти. Когда количество
+    сущностей в памяти превышает бюджет, давно не использованные проекты
+    (LRU) вместе с задачами сжимаются и выгружаются в файл-сегмент.
+    При обращении к выгруженному проекту или его задаче они загружаются
+    обратно (промах, fault).
+    
+    Сегмент служит только областью подкачки и очищается при открытии.
+    Объекты, полученные до вытеснения, после повторной загрузки заменяются
+    новыми, поэтому держать ссылки на сущности между операциями не следует.
+    Пока активна единица работы, вытеснение откладывается до commit.
+    
+    Поиск (``find_*``, ``get_all``) не загружает холодные проекты
+    в память: они возвращаются как отсоединенные копии. Для холодных
+    сущностей в памяти хранится сводка (владелец проекта, проект,
+    исполнитель и статус задачи), поэтому с диска читаются только
+    проекты, содержащие найденные сущности.
+    """
+    
+    def __init__(
+        self,
+        segment_path: str,
+        max_resident: int = 100_000,
+        id_allocator: Optional[IIdAllocator] = None
+    ):
+        """Инициализация хранилища.
+        
+        Args:
+            segment_path: Путь к файлу-сегменту для холодных проектов
+            max_resident: Бюджет памяти - максимум проектов и задач в памяти
+            id_allocator: Генератор ID для проектов и задач
+        """
+        if max_resident <= 0:
+            raise ValueError("Бюджет памяти должен быть положительным")
+        self.segment_path = segment_path
+        self.max_resident = max_resident
+        self.evictions = 0
+        self.faults = 0
+        self.project_repo = TieredProjectRepository(self, id_allocator)
+        self.task_repo = TieredTaskRepository(self, id_allocator)
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+        self._cold: Dict[int, Tuple[int, int]] = {}  # ID проекта -> (смещение, длина)
+        self._cold_owners: Dict[int, int] = {}  # ID проекта -> ID владельца
+        self._cold_tasks: Dict[int, _ColdTask] = {}  # ID задачи -> сводка
+        self._garbage = 0
+        self._segment = open(segment_path, "w+b")
+    
+    @property
+    def resident(self) -> int:
+        """Количество проектов и задач в памяти."""
+        return len(self.project_repo._storage) + len(self.task_repo._storage)
+    
+    def is_cold(self, project_id: int) -> bool:
+        """Выгружен ли проект на диск."""
+        return project_id in self._cold
+    
+    def touch(self, project_id: int) -> None:
+        """Отметить использование проекта и при необходимости загрузить его."""
+        if project_id in self._cold:
+            self._fault(project_id)
+        elif project_id in self._lru:
+            self._lru.move_to_end(project_id)
+    
+    def enforce_budget(self) -> None:
+        """Вытеснить давно не использованные проекты сверх бюджета."""
+        if self.project_repo._uow is not None or self.task_repo._uow is not None:
+            return
+        self._shrink()
+    
+    def _shrink(self) -> None:
+        # Последний использованный проект не вытесняется
+        while self.resident > self.max_resident and len(self._lru) > 1:
+            project_id = next(iter(self._lru))
+            self._evict(project_id)
+    
+    def read_cold(self, project_ids: Optional[Iterable[int]] = None) -> List[Tuple[Project, List[Task]]]:
+        """Прочитать холодные проекты без загрузки в память хранилища.
+        
+        Args:
+            project_ids: ID холодных проектов (None - все холодные проекты)
+        
+        Returns:
+            Отсоединенные копии проектов и их задач
+        """
+        if project_ids is None:
+            project_ids = list(self._cold)
+        return [self._read(project_id) for project_id in project_ids]
+    
+    def cold_project_of(self, task_id: int) -> Optional[int]:
+        """ID холодного проекта, которому принадлежит задача (None - задача в памяти)."""
+        summary = self._cold_tasks.get(task_id)
+        return None if summary is None else summary.project_id
+    
+    def close(self) -> None:
+        """Закрыть и удалить файл-сегмент."""
+        self._segment.close()
+        if os.path.exists(self.segment_path):
+            os.remove(self.segment_path)
+    
+    def _evict(self, project_id: int) -> None:
+        project = self.project_repo._storage.pop(project_id)
+        task_ids = self.task_repo._by_project.get(project_id, set())
+        tasks = [self.task_repo._storage.pop(task_id) for task_id in task_ids]
+        payload = zlib.compress(pickle.dumps((project, tasks), pickle.HIGHEST_PROTOCOL), 1)
+        
+        self._segment.seek(0, os.SEEK_END)
+        offset = self._segment.tell()
+        self._segment.write(_LENGTH.pack(len(payload)))
+        self._segment.write(payload)
+        self._cold[project_id] = (offset, len(payload))
+        self._cold_owners[project_id] = project.owner_id
+        for task in tasks:
+            self._cold_tasks[task.id] = _ColdTask(task.project_id, task.assignee_id, task.status)
+        del self._lru[project_id]
+        self.evictions += 1
+    
+    def _read(self, project_id: int) -> Tuple[Project, List[Task]]:
+        offset, length = self._cold[project_id]
+        self._segment.seek(offset + _LENGTH.size)
+        return pickle.loads(zlib.decompress(self._segment.read(length)))
+    
+    def _fault(self, project_id: int) -> None:
+        project, tasks = self._read(project_id)
+        self._garbage += self._cold.pop(project_id)[1] + _LENGTH.size
+        del self._cold_owners[project_id]
+        self.project_repo._storage[project_id] = project
+        for task in tasks:
+            self.task_repo._storage[task.id] = task
+            self._cold_tasks.pop(task.id, None)
+        self._lru[project_id] = None
+        self.faults += 1
+        self.enforce_budget()
+        if self._garbage > _MIN_COMPACT_BYTES and self._garbage > self._live_bytes():
+            self._compact()
+    
+    def _live_bytes(self) -> int:
+        return sum(length + _LENGTH.size for _, length in self._cold.values())
+    
+    def _compact(self) -> None:
+        """Переписать сегмент, оставив только холодные проекты."""
+        compact_path = self.segment_path + ".compact"
+        with open(compact_path, "wb") as target:
+            for project_id, (offset, length) in list(self._cold.items()):
+                self._segment.seek(offset)
+                self._cold[project_id] = (target.tell(), length)
+                target.write(self._segment.read(length + _LENGTH.size))
+        self._segment.close()
+        os.replace(compact_path, self.segment_path)
+        self._segment = open(self.segment_path, "r+b")
+        self._garbage = 0
+
+
+class TieredProjectRepository(ProjectRepository):
+    """Репозиторий проектов, работающий поверх ``TieredStore``."""
+    
+    def __init__(self, store: TieredStore, id_allocator: Optional[IIdAllocator] = None):
+        super().__init__(id_allocator)
+        self._store = store
+    
+    def get_by_id(self, entity_id: int) -> Optional[Project]:
+        """Получить проект по ID, загрузив его с диска при необходимости."""
+        self._store.touch(entity_id)
+        return super().get_by_id(entity_id)
+    
+    def get_all(self) -> List[Project]:
+        """Получить все проекты; холодные возвращаются как копии только для чтения."""
+        return super().get_all()
+    
+    def update(self, entity: Project) -> None:
+        """Обновить проект."""
+        self._store.touch(entity.id)
+        super().update(entity)
+    
+    def delete(self, entity_id: int) -> None:
+        """Удалить проект."""
+        self._store.touch(entity_id)
+        super().delete(entity_id)
+    
+    def find_by_owner(self, owner_id: int) -> List[Project]:
+        """Найти проекты владельца; холодные читаются только при совпадении."""
+        cold_ids = [i for i, owner in self._store._cold_owners.items() if owner == owner_id]
+        found = [p for p in self._storage.values() if p.owner_id == owner_id]
+        found.extend(project for project, _ in self._store.read_cold(cold_ids))
+        return self._track(found)
+    
+    def find_created_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Project]:
+        """Найти проекты, созданные в полуинтервале [start, end), без загрузки холодных."""
+        return self._track(self._resolve(self._created_index.range(start, end)))
+    
+    def find_latest(self, count: int) -> List[Project]:
+        """Найти последние созданные проекты без загрузки холодных."""
+        return self._track(self._resolve(self._created_index.latest(count)))
+    
+    def commit_batch(self, new: List[Project], dirty: List[Project], deleted: List[Project]) -> None:
+        """Зафиксировать пакет и вытеснить проекты сверх бюджета."""
+        super().commit_batch(new, dirty, deleted)
+        self._store._shrink()
+    
+    def _entities(self) -> List[Project]:
+        return list(self._storage.values()) + [project for project, _ in self._store.read_cold()]
+    
+    def _track(self, entities: List[Project]) -> List[Project]:
+        """Запомнить в единице работы только сущности в памяти.
+        
+        Отсоединенные копии холодных проектов не отслеживаются: откат вернул бы
+        их в хранилище вместо загруженных с диска.
+        """
+        if self._uow is not None:
+            for entity in entities:
+                if self._storage.get(entity.id) is entity:
+                    self._uow.register_clean(self, entity)
+        return entities
+    
+    def _resolve(self, project_ids: List[int]) -> List[Project]:
+        """Сущности по ID в заданном порядке; холодные - отсоединенные копии."""
+        cold_ids = [i for i in project_ids if i not in self._storage]
+        cold = {project.id: project for project, _ in self._store.read_cold(cold_ids)}
+        return [self._storage.get(i) or cold[i] for i in project_ids]
+    
+    def _insert(self, entity: Project) -> None:
+        super()._insert(entity)
+        self._store._lru[entity.id] = None
+        self._store._lru.move_to_end(entity.id)
+        self._store.enforce_budget()
+    
+    def _remove(self, entity_id: int) -> Project:
+        self._store._lru.pop(entity_id, None)
+        return super()._remove(entity_id)
+
+
+class TieredTaskRepository(TaskRepository):
+    """Репозиторий задач, работающий поверх ``TieredStore``."""
+    
+    def __init__(self, store: TieredStore, id_allocator: Optional[IIdAllocator] = None):
+        super().__init__(id_allocator)
+        self._store = store
+        self._by_project: Dict[int, Set[int]] = {}
+    
+    def get_by_id(self, entity_id: int) -> Optional[Task]:
+        """Получить задачу по ID, загрузив ее проект с диска при необходимости."""
+        project_id = self._store.cold_project_of(entity_id)
+        if project_id is not None:
+            self._store.touch(project_id)
+        task = super().get_by_id(entity_id)
+        if task is not None and project_id is None:
+            self._store.touch(task.project_id)
+        return task
+    
+    def get_all(self) -> List[Task]:
+        """Получить все задачи; холодные возвращаются как копии только для чтения."""
+        return super().get_all()
+    
+    def update(self, entity: Task) -> None:
+        """Обновить задачу."""
+        project_id = self._store.cold_project_of(entity.id)
+        if project_id is not None:
+            self._store.touch(project_id)
+        super().update(entity)
+    
+    def delete(self, entity_id: int) -> None:
+        """Удалить задачу."""
+        project_id = self._store.cold_project_of(entity_id)
+        if project_id is not None:
+            self._store.touch(project_id)
+        super().delete(entity_id)
+    
+    def find_by_project(self, project_id: int) -> List[Task]:
+        """Найти задачи по проекту без полного просмотра хранилища."""
+        self._store.touch(project_id)
+        return self._track([self._storage[i] for i in self._by_project.get(project_id, ())])
+    
+    def find_by_assignee(self, assignee_id: int) -> List[Task]:
+        """Найти задачи по исполнителю; холодные читаются только при совпадении."""
+        found = [t for t in self._storage.values() if t.assignee_id == assignee_id]
+        cold_ids = [
+            i for i, summary in self._store._cold_tasks.items() if summary.assignee_id == assignee_id
+        ]
+        found.extend(self._resolve(cold_ids))
+        return self._track(found)
+    
+    def find_by_status(self, status: TaskStatus) -> List[Task]:
+        """Найти задачи по статусу; холодные читаются только при совпадении."""
+        found = [t for t in self._storage.values() if t.status == status]
+        cold_ids = [
+            i for i, summary in self._store._cold_tasks.items() if summary.status == status
+        ]
+        found.extend(self._resolve(cold_ids))
+        return self._track(found)
+    
+    def find_created_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Task]:
+        """Найти задачи, созданные в полуинтервале [start, end), без загрузки холодных."""
+        return self._track(self._resolve(self._created_index.range(start, end)))
+    
+    def find_latest(self, count: int) -> List[Task]:
+        """Найти последние созданные задачи без загрузки холодных."""
+        return self._track(self._resolve(self._created_index.latest(count)))
+    
+    def commit_batch(self, new: List[Task], dirty: List[Task], deleted: List[Task]) -> None:
+        """Зафиксировать пакет и вытеснить проекты сверх бюджета."""
+        super().commit_batch(new, dirty, deleted)
+        self._store._shrink()
+    
+    def _entities(self) -> List[Task]:
+        tasks = list(self._storage.values())
+        for _, cold_tasks in self._store.read_cold():
+            tasks.extend(cold_tasks)
+        return tasks
+    
+    def _track(self, entities: List[Task]) -> List[Task]:
+        """Запомнить в единице работы только сущности в памяти.
+        
+        Отсоединенные копии холодных задач не отслеживаются: откат вернул бы
+        их в хранилище вместо загруженных с диска.
+        """
+        if self._uow is not None:
+            for entity in entities:
+                if self._storage.get(entity.id) is entity:
+                    self._uow.register_clean(self, entity)
+        return entities
+    
+    def _resolve(self, task_ids: List[int]) -> List[Task]:
+        """Задачи по ID в заданном порядке; холодные - отсоединенные копии.
+        
+        Каждый холодный проект читается с диска один раз.
+        """
+        cold_projects = {self._store.cold_project_of(i) for i in task_ids if i not in self._storage}
+        cold: Dict[int, Task] = {}
+        for _, tasks in self._store.read_cold(cold_projects):
+            cold.update((task.id, task) for task in tasks)
+        return [self._storage.get(i) or cold[i] for i in task_ids]
+    
+    def _insert(self, entity: Task) -> None:
+        # Проект задачи должен быть в памяти, иначе задача разойдется с его копией
+        self._store.touch(entity.project_id)
+        previous = self._storage.get(entity.id)
+        if previous is not None and previous.project_id != entity.project_id:
+            self._by_project[previous.project_id].discard(entity.id)
+        super()._insert(entity)
+        self._by_project.setdefault(entity.project_id, set()).add(entity.id)
+        self._store.enforce_budget()
+    
+    def _remove(self, entity_id: int) -> Task:
+        entity = super()._remove(entity_id)
+        self._by_project.get(entity.project_id, set()).discard(entity_id)
+        return entity
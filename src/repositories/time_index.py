@@ -0,0 +1,128 @@
+"""Упорядоченный по времени индекс для диапазонных запросов."""
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from .base import InMemoryRepository, T
+from .id_allocator import IIdAllocator
+
+
+class TimeIndex:
+    """Отсортированный индекс пар (момент времени, ID сущности).
+    
+    Оптимизирован под добавление в конец: ID и метки времени обычно
+    приходят по возрастанию, и тогда вставка стоит O(1). Записи не по
+    порядку (например, при импорте) вставляются бинарным поиском.
+    Диапазонные запросы и выборка последних N записей выполняются
+    бинарным поиском без полного просмотра.
+    """
+    
+    def __init__(self):
+        self._keys: List[Tuple[datetime, int]] = []
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def insert(self, moment: datetime, entity_id: int) -> None:
+        """Добавить запись в индекс.
+        
+        Args:
+            moment: Метка времени
+            entity_id: ID сущности
+        """
+        key = (moment, entity_id)
+        if not self._keys or self._keys[-1] <= key:
+            self._keys.append(key)
+        else:
+            insort(self._keys, key)
+    
+    def remove(self, moment: datetime, entity_id: int) -> None:
+        """Удалить запись из индекса, если она есть.
+        
+        Args:
+            moment: Метка времени
+            entity_id: ID сущности
+        """
+        key = (moment, entity_id)
+        pos = bisect_left(self._keys, key)
+        if pos < len(self._keys) and self._keys[pos] == key:
+            del self._keys[pos]
+    
+    def range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[int]:
+        """Получить ID сущностей с меткой времени в полуинтервале [start, end).
+        
+        Args:
+            start: Начало интервала (None - без ограничения)
+            end: Конец интервала, не включается (None - без ограничения)
+        
+        Returns:
+            Список ID в порядке возрастания времени
+        """
+        lo = 0 if start is None else bisect_left(self._keys, (start,))
+        hi = len(self._keys) if end is None else bisect_left(self._keys, (end,))
+        return [entity_id for _, entity_id in self._keys[lo:hi]]
+    
+    def latest(self, count: int) -> List[int]:
+        """Получить ID последних по времени сущностей.
+        
+        Args:
+            count: Количество записей
+        
+        Returns:
+            Список ID, от самой новой к самой старой
+        """
+        if count <= 0:
+            return []
+        return [entity_id for _, entity_id in reversed(self._keys[-count:])]
+
+
+class TimeIndexedRepository(InMemoryRepository[T]):
+    """Репозиторий в памяти с индексом по полю ``created_at``."""
+    
+    def __init__(self, id_allocator: Optional[IIdAllocator] = None):
+        super().__init__(id_allocator)
+        self._created_index = TimeIndex()
+        # ID -> метка времени, под которой сущность лежит в индексе
+        self._indexed_at: Dict[int, datetime] = {}
+    
+    def find_created_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[T]:
+        """Найти сущности, созданные в полуинтервале [start, end).
+        
+        Args:
+            start: Начало интервала (None - без ограничения)
+            end: Конец интервала, не включается (None - без ограничения)
+        
+        Returns:
+            Список сущностей в порядке создания
+        """
+        return self._track([self._storage[i] for i in self._created_index.range(start, end)])
+    
+    def find_latest(self, count: int) -> List[T]:
+        """Найти последние созданные сущности.
+        
+        Args:
+            count: Количество сущностей
+        
+        Returns:
+            Список сущностей, от самой новой к самой старой
+        """
+        return self._track([self._storage[i] for i in self._created_index.latest(count)])
+    
+    def _insert(self, entity: T) -> None:
+        # Индекс меняется только для новых сущностей и при смене created_at:
+        # обновления на месте не должны сдвигать отсортированный список
+        indexed_at = self._indexed_at.get(entity.id)
+        if indexed_at != entity.created_at:
+            if indexed_at is not None:
+                self._created_index.remove(indexed_at, entity.id)
+            self._created_index.insert(entity.created_at, entity.id)
+            self._indexed_at[entity.id] = entity.created_at
+        super()._insert(entity)
+    
+    def _remove(self, entity_id: int) -> T:
+        entity = super()._remove(entity_id)
+        self._created_index.remove(self._indexed_at.pop(entity_id), entity_id)
+        return entity
@@ -0,0 +1,199 @@
+"""Единица работы (Unit of Work) для пакетной фиксации изменений."""
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .base import InMemoryRepository
+from .user_repository import UserRepository
+from .project_repository import ProjectRepository
+from .task_repository import TaskRepository
+
+
+class UnitOfWork:
+    """Единица работы над репозиториями пользователей, проектов и задач.
+    
+    Внутри блока ``with`` репозитории сообщают о новых, измененных и
+    удаленных сущностях. При выходе из блока изменения фиксируются одним
+    пакетом на репозиторий, а при исключении откатываются.
+    
+    Вложенные блоки не фиксируют изменения сами: фиксация происходит
+    только при выходе из внешнего блока. Поэтому тысячи операций сервисов,
+    выполненные внутри одного внешнего блока, стоят одного commit.
+    Действия над состоянием вне репозиториев (см. ``on_commit``)
+    выполняются только после фиксации.
+    """
+    
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        project_repo: ProjectRepository,
+        task_repo: TaskRepository
+    ):
+        """Инициализация единицы работы.
+        
+        Args:
+            user_repo: Репозиторий пользователей
+            project_repo: Репозиторий проектов
+            task_repo: Репозиторий задач
+        """
+        self.user_repo = user_repo
+        self.project_repo = project_repo
+        self.task_repo = task_repo
+        self.commit_count = 0
+        self._repos: List[InMemoryRepository] = [user_repo, project_repo, task_repo]
+        self._depth = 0
+        self._reset()
+    
+    def __enter__(self) -> "UnitOfWork":
+        if self._depth == 0:
+            for repo in self._repos:
+                if repo._uow is not None:
+                    raise RuntimeError("Репозиторий уже участвует в другой единице работы")
+            for repo in self._repos:
+                repo._uow = self
+        self._depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._depth -= 1
+        if self._depth > 0:
+            return False
+        actions: List[Callable[[], None]] = []
+        try:
+            if exc_type is None:
+                actions = self._on_commit
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            for repo in self._repos:
+                repo._uow = None
+        # Действия выполняются вне единицы работы и не попадают в следующую транзакцию
+        for action in actions:
+            action()
+        return False
+    
+    @property
+    def active(self) -> bool:
+        """Открыта ли единица работы."""
+        return self._depth > 0
+    
+    def register_new(self, repo: InMemoryRepository, entity: Any, allocated: bool = False) -> None:
+        """Зарегистрировать добавленную сущность.
+        
+        Args:
+            repo: Репозиторий
+            entity: Сущность
+            allocated: ID выдан репозиторием при добавлении (при откате освобождается)
+        """
+        self._deleted[repo].pop(entity.id, None)
+        self._new[repo][entity.id] = entity
+        if allocated:
+            self._allocated[repo].append(entity)
+    
+    def register_clean(self, repo: InMemoryRepository, entity: Any) -> None:
+        """Запомнить исходное состояние прочитанной сущности для отката."""
+        snapshots = self._snapshots[repo]
+        if entity.id not in snapshots and entity.id not in self._new[repo]:
+            snapshots[entity.id] = (entity, self._snapshot(entity))
+    
+    def register_dirty(self, repo: InMemoryRepository, entity: Any) -> None:
+        """Зарегистрировать измененную сущность."""
+        if entity.id not in self._new[repo]:
+            self._dirty[repo][entity.id] = entity
+    
+    def register_deleted(self, repo: InMemoryRepository, entity: Any) -> None:
+        """Зарегистрировать удаленную сущность."""
+        self._dirty[repo].pop(entity.id, None)
+        if self._new[repo].pop(entity.id, None) is None:
+            self._deleted[repo][entity.id] = entity
+    
+    def on_commit(self, action: Callable[[], None]) -> None:
+        """Выполнить действие после фиксации внешнего блока; при откате оно отбрасывается.
+        
+        Args:
+            action: Действие без аргументов
+        """
+        self._on_commit.append(action)
+    
+    def commit(self) -> None:
+        """Зафиксировать накопленные изменения одним пакетом на репозиторий.
+        
+        Если фиксация пакета завершилась исключением, изменения откатываются,
+        а исключение передается дальше.
+        """
+        try:
+            for repo in self._repos:
+                new = list(self._new[repo].values())
+                dirty = list(self._dirty[repo].values())
+                deleted = list(self._deleted[repo].values())
+                if new or dirty or deleted:
+                    repo.commit_batch(new, dirty, deleted)
+        except Exception:
+            self.rollback()
+            raise
+        self.commit_count += 1
+        self._reset()
+    
+    def rollback(self) -> None:
+        """Отменить все изменения, сделанные внутри единицы работы."""
+        try:
+            for repo in self._repos:
+                for entity_id in self._new[repo]:
+                    repo._remove(entity_id)
+                # ID освобождаются в обратном порядке выдачи
+                for entity in reversed(self._allocated[repo]):
+                    repo._release_id(entity.id)
+                    entity.id = None
+                for entity, (state, lengths) in self._snapshots[repo].values():
+                    entity.__dict__.clear()
+                    entity.__dict__.update(state)
+                    for key, length in lengths.items():
+                        del state[key][length:]
+                    repo._insert(entity)
+                for entity in self._deleted[repo].values():
+                    repo._insert(entity)
+        finally:
+            self._reset()
+    
+    def _reset(self) -> None:
+        self._new: Dict[InMemoryRepository, Dict[int, Any]] = {r: {} for r in self._repos}
+        self._dirty: Dict[InMemoryRepository, Dict[int, Any]] = {r: {} for r in self._repos}
+        self._deleted: Dict[InMemoryRepository, Dict[int, Any]] = {r: {} for r in self._repos}
+        self._snapshots: Dict[InMemoryRepository, Dict[int, tuple]] = {r: {} for r in self._repos}
+        self._allocated: Dict[InMemoryRepository, List[Any]] = {r: [] for r in self._repos}
+        self._on_commit: List[Callable[[], None]] = []
+    
+    @staticmethod
+    def _snapshot(entity: Any) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        # Списки (например, Project.tasks) только пополняются (add_task),
+        # поэтому вместо копии запоминается их длина
+        state = entity.__dict__.copy()
+        lengths = {key: len(value) for key, value in state.items() if isinstance(value, list)}
+        return state, lengths
+
+
+def transaction(uow: Optional[UnitOfWork]):
+    """Контекст транзакции для сервисов.
+    
+    Args:
+        uow: Единица работы или None
+    
+    Returns:
+        Единица работы или пустой контекст, если она не задана
+    """
+    return uow if uow is not None else nullcontext()
+
+
+def after_commit(uow: Optional[UnitOfWork], action: Callable[[], None]) -> None:
+    """Выполнить действие после фиксации транзакции.
+    
+    Внутри открытой единицы работы действие откладывается до фиксации
+    внешнего блока и отбрасывается при откате, иначе выполняется сразу.
+    
+    Args:
+        uow: Единица работы или None
+        action: Действие без аргументов
+    """
+    if uow is not None and uow.active:
+        uow.on_commit(action)
+    else:
+        action()
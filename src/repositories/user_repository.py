@@ -16,7 +16,7 @@ class UserRepository(InMemoryRepository[User]):
         Returns:
             Пользователь или None
         """
-        for user in self.get_all():
+        for user in self._entities():
             if user.email == email:
-                return user
+                return self._track([user])[0]
         return None
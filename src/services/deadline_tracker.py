@@ -0,0 +1,313 @@
+"""Отслеживание сроков задач на иерархическом колесе таймеров."""
+import heapq
+import math
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from src.models.task import Task, TaskStatus
+
+OVERDUE = "overdue"
+DUE_SOON = "due_soon"
+
+
+class TimingWheel:
+    """Иерархическое колесо таймеров.
+    
+    Время делится на тики длиной ``tick``. Уровень 0 содержит ``slots``
+    ячеек по одному тику, каждый следующий уровень - ячейки в ``slots``
+    раз крупнее. Таймер кладется на уровень, соответствующий удаленности
+    срока, и по мере приближения срока переносится на нижние уровни.
+    Добавление и отмена выполняются за O(1), каждый таймер переносится
+    не более ``levels`` раз. Сроки дальше горизонта колеса хранятся
+    в куче переполнения.
+    """
+    
+    def __init__(
+        self,
+        tick: timedelta = timedelta(minutes=1),
+        slots: int = 64,
+        levels: int = 4,
+        start: Optional[datetime] = None
+    ):
+        """Инициализация колеса.
+        
+        Args:
+            tick: Длина тика (точность срабатывания)
+            slots: Количество ячеек на уровне
+            levels: Количество уровней
+            start: Начальный момент (по умолчанию datetime.now())
+        """
+        if tick <= timedelta(0) or slots < 2 or levels < 1:
+            raise ValueError("Некорректные параметры колеса таймеров")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._origin = start or datetime.now()
+        self._current = 0
+        self._wheel: List[List[Dict[Hashable, Any]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: List[Tuple[int, int, Hashable]] = []
+        self._sequence = 0
+        # Ключ -> (тик срабатывания, уровень, ячейка); уровень -1 - переполнение, -2 - истек
+        self._entries: Dict[Hashable, Tuple[int, int, int]] = {}
+        self._payloads: Dict[Hashable, Any] = {}
+        self._expired: List[Hashable] = []
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+    
+    @property
+    def now(self) -> datetime:
+        """Текущее время колеса."""
+        return self._origin + self._current * self.tick
+    
+    def schedule(self, key: Hashable, moment: datetime, payload: Any = None) -> None:
+        """Запланировать (или перепланировать) таймер.
+        
+        Args:
+            key: Ключ таймера
+            moment: Момент срабатывания
+            payload: Данные, возвращаемые при срабатывании
+        """
+        self.cancel(key)
+        deadline = math.ceil((moment - self._origin) / self.tick)
+        self._payloads[key] = payload
+        self._place(key, deadline)
+    
+    def cancel(self, key: Hashable) -> bool:
+        """Отменить таймер.
+        
+        Args:
+            key: Ключ таймера
+        
+        Returns:
+            True, если таймер был запланирован
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        _, level, slot = entry
+        if level >= 0:
+            del self._wheel[level][slot][key]
+        elif level == -2:
+            self._expired.remove(key)
+        # Записи кучи переполнения удаляются лениво
+        self._payloads.pop(key, None)
+        return True
+    
+    def advance(self, now: datetime) -> List[Tuple[Hashable, Any]]:
+        """Продвинуть колесо до момента ``now`` и собрать сработавшие таймеры.
+        
+        Args:
+            now: Текущий момент
+        
+        Returns:
+            Пары (ключ, данные) сработавших таймеров
+        """
+        target = math.floor((now - self._origin) / self.tick)
+        fired = self._drain_expired()
+        while self._current < target:
+            if not self._entries:
+                self._current = target
+                break
+            self._current += 1
+            self._cascade()
+            # Перенос мог выдать таймеры, срок которых - текущий тик
+            fired.extend(self._drain_expired())
+            slot = self._wheel[0][self._current % self.slots]
+            if slot:
+                keys = list(slot)
+                slot.clear()
+                fired.extend(self._fire(key) for key in keys)
+        return fired
+    
+    def _drain_expired(self) -> List[Tuple[Hashable, Any]]:
+        fired = [self._fire(key) for key in self._expired]
+        self._expired = []
+        return fired
+    
+    def _fire(self, key: Hashable) -> Tuple[Hashable, Any]:
+        del self._entries[key]
+        return key, self._payloads.pop(key)
+    
+    def _place(self, key: Hashable, deadline: int) -> None:
+        delta = deadline - self._current
+        if delta <= 0:
+            self._entries[key] = (deadline, -2, 0)
+            self._expired.append(key)
+            return
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.slots:
+                slot = (deadline // span) % self.slots
+                self._wheel[level][slot][key] = None
+                self._entries[key] = (deadline, level, slot)
+                return
+            span *= self.slots
+        self._sequence += 1
+        heapq.heappush(self._overflow, (deadline, self._sequence, key))
+        self._entries[key] = (deadline, -1, self._sequence)
+    
+    def _cascade(self) -> None:
+        """Перенести таймеры с верхних уровней, чьи ячейки наступили."""
+        horizon = self.slots ** self.levels
+        if self._current % horizon == 0:
+            while self._overflow and self._overflow[0][0] < self._current + horizon:
+                deadline, sequence, key = heapq.heappop(self._overflow)
+                if self._entries.get(key) == (deadline, -1, sequence):
+                    self._place(key, deadline)
+        for level in range(self.levels - 1, 0, -1):
+            span = self.slots ** level
+            if self._current % span:
+                continue
+            slot = self._wheel[level][(self._current // span) % self.slots]
+            keys = list(slot)
+            slot.clear()
+            for key in keys:
+                self._place(key, self._entries[key][0])
+
+
+class DeadlineTracker:
+    """Отслеживание сроков задач без полного просмотра хранилища.
+    
+    Для каждой задачи со сроком на колесе планируются два таймера:
+    «скоро срок» (за ``due_soon_window`` до срока) и «просрочена».
+    Завершение задачи или смена срока отменяет или переносит таймеры.
+    Просроченные задачи индексируются по проекту и исполнителю, поэтому
+    запросы просроченных задач не требуют просмотра всех задач.
+    """
+    
+    def __init__(
+        self,
+        due_soon_window: timedelta = timedelta(hours=24),
+        tick: timedelta = timedelta(minutes=1),
+        start: Optional[datetime] = None,
+        on_overdue: Optional[Callable[[int], None]] = None,
+        on_due_soon: Optional[Callable[[int], None]] = None
+    ):
+        """Инициализация трекера.
+        
+        Args:
+            due_soon_window: За сколько до срока срабатывает «скоро срок»
+            tick: Точность срабатывания
+            start: Начальный момент (по умолчанию datetime.now())
+            on_overdue: Обработчик просрочки (получает ID задачи)
+            on_due_soon: Обработчик приближения срока (получает ID задачи)
+        """
+        self.due_soon_window = due_soon_window
+        self.on_overdue = on_overdue
+        self.on_due_soon = on_due_soon
+        self._wheel = TimingWheel(tick=tick, start=start)
+        self._owners: Dict[int, Tuple[int, Optional[int]]] = {}  # задача -> (проект, исполнитель)
+        self._overdue_by_project: Dict[int, Set[int]] = {}
+        self._overdue_by_assignee: Dict[Optional[int], Set[int]] = {}
+        self._due_soon: Set[int] = set()
+    
+    def schedule(self, task: Task) -> None:
+        """Запланировать таймеры задачи по ее сроку.
+        
+        Задачи без срока и завершенные задачи снимаются с отслеживания.
+        
+        Args:
+            task: Задача
+        """
+        self.cancel(task.id)
+        if task.due_date is None or task.status == TaskStatus.COMPLETED:
+            return
+        self._owners[task.id] = (task.project_id, task.assignee_id)
+        self._wheel.schedule((task.id, DUE_SOON), task.due_date - self.due_soon_window)
+        self._wheel.schedule((task.id, OVERDUE), task.due_date)
+    
+    def bootstrap(self, tasks: Iterable[Task]) -> int:
+        """Запланировать таймеры задач, уже находящихся в хранилище.
+        
+        Сроки, наступившие до запуска, срабатывают при ближайшем ``advance``.
+        
+        Args:
+            tasks: Задачи хранилища
+        
+        Returns:
+            Количество отслеживаемых задач
+        """
+        for task in tasks:
+            if task.due_date is not None and task.status != TaskStatus.COMPLETED:
+                self.schedule(task)
+        return len(self._owners)
+    
+    def cancel(self, task_id: int) -> None:
+        """Снять задачу с отслеживания.
+        
+        Args:
+            task_id: ID задачи
+        """
+        self._wheel.cancel((task_id, DUE_SOON))
+        self._wheel.cancel((task_id, OVERDUE))
+        self._due_soon.discard(task_id)
+        owner = self._owners.pop(task_id, None)
+        if owner is not None:
+            project_id, assignee_id = owner
+            self._discard(self._overdue_by_project, project_id, task_id)
+            self._discard(self._overdue_by_assignee, assignee_id, task_id)
+    
+    def update_assignee(self, task: Task) -> None:
+        """Обновить исполнителя отслеживаемой задачи.
+        
+        Args:
+            task: Задача с новым исполнителем
+        """
+        owner = self._owners.get(task.id)
+        if owner is None or owner[1] == task.assignee_id:
+            return
+        project_id, previous = owner
+        self._owners[task.id] = (project_id, task.assignee_id)
+        if task.id in self._overdue_by_project.get(project_id, ()):
+            self._discard(self._overdue_by_assignee, previous, task.id)
+            self._overdue_by_assignee.setdefault(task.assignee_id, set()).add(task.id)
+    
+    def advance(self, now: Optional[datetime] = None) -> List[Tuple[str, int]]:
+        """Обработать наступившие сроки.
+        
+        Args:
+            now: Текущий момент (по умолчанию datetime.now())
+        
+        Returns:
+            События (вид события, ID задачи) в порядке срабатывания
+        """
+        events = []
+        for (task_id, kind), _ in self._wheel.advance(now or datetime.now()):
+            if kind == OVERDUE:
+                self._due_soon.discard(task_id)
+                project_id, assignee_id = self._owners[task_id]
+                self._overdue_by_project.setdefault(project_id, set()).add(task_id)
+                self._overdue_by_assignee.setdefault(assignee_id, set()).add(task_id)
+                if self.on_overdue is not None:
+                    self.on_overdue(task_id)
+            else:
+                self._due_soon.add(task_id)
+                if self.on_due_soon is not None:
+                    self.on_due_soon(task_id)
+            events.append((kind, task_id))
+        return events
+    
+    def overdue_by_project(self, project_id: int) -> Set[int]:
+        """ID просроченных задач проекта."""
+        return set(self._overdue_by_project.get(project_id, ()))
+    
+    def overdue_by_assignee(self, assignee_id: int) -> Set[int]:
+        """ID просроченных задач исполнителя."""
+        return set(self._overdue_by_assignee.get(assignee_id, ()))
+    
+    def due_soon(self) -> Set[int]:
+        """ID задач, срок которых скоро наступит."""
+        return set(self._due_soon)
+    
+    @staticmethod
+    def _discard(index: Dict[Any, Set[int]], key: Any, task_id: int) -> None:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.discard(task_id)
+            if not bucket:
+                del index[key]
@@ -1,22 +1,92 @@
 """Сервис для работы с проектами."""
-from typing import List, Optional
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from operator import attrgetter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 from src.models.project import Project
+from src.models.task import TaskStatus
 from src.repositories.project_repository import ProjectRepository
+from src.repositories.task_repository import TaskRepository
 from src.repositories.user_repository import UserRepository
+from src.repositories.unit_of_work import UnitOfWork, transaction
+
+
+class ProjectProgress(NamedTuple):
+    """Прогресс проекта и количество задач по статусам."""
+    project_id: int
+    total: int
+    progress: float
+    status_counts: Dict[TaskStatus, int]
+
+
+_STATUSES = list(TaskStatus)
+
+# Проекты, унаследованные процессами пула при fork (копирование при записи)
+_forked_projects: Dict[int, Project] = {}
+
+# Минимальное число задач, при котором подсчет в пуле окупает передачу блоков
+DEFAULT_PARALLEL_THRESHOLD = 1_000_000
+
+
+def _count_statuses(projects: Iterable[Project]) -> List[Tuple[int, List[int]]]:
+    """Подсчитать задачи по статусам для блока проектов.
+    
+    Статусы проекта выбираются в колонку одним проходом, а подсчет по
+    каждому статусу выполняется встроенным ``list.count`` без цикла
+    на уровне Python.
+    
+    Args:
+        projects: Проекты
+    
+    Returns:
+        Пары (ID проекта, количество задач по статусам в порядке TaskStatus)
+    """
+    get_status = attrgetter("status")
+    result = []
+    for project in projects:
+        column = list(map(get_status, project.tasks))
+        result.append((project.id, [column.count(status) for status in _STATUSES]))
+    return result
+
+
+def _count_forked_chunk(project_ids: List[int]) -> List[Tuple[int, List[int]]]:
+    """Подсчитать статусы для блока проектов в процессе пула."""
+    return _count_statuses(_forked_projects[i] for i in project_ids)
 
 
 class ProjectService:
     """Сервис для управления проектами."""
     
-    def __init__(self, project_repo: ProjectRepository, user_repo: UserRepository):
+    def __init__(
+        self,
+        project_repo: ProjectRepository,
+        user_repo: UserRepository,
+        uow: Optional[UnitOfWork] = None,
+        task_repo: Optional[TaskRepository] = None
+    ):
         """Инициализация сервиса.
         
         Args:
             project_repo: Репозиторий проектов
             user_repo: Репозиторий пользователей
+            uow: Единица работы для пакетной фиксации изменений
+            task_repo: Репозиторий задач; позволяет переиспользовать пул
+                процессов ``get_portfolio_progress``, пока задачи не меняются
         """
         self.project_repo = project_repo
         self.user_repo = user_repo
+        self.uow = uow
+        self.task_repo = task_repo
+        # Счетчик записей в репозитории: пул действителен, пока он не изменился
+        self._generation = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_generation = -1
+        self._pool_workers: Optional[int] = None
+        project_repo.subscribe(self._on_change)
+        if task_repo is not None:
+            task_repo.subscribe(self._on_change)
     
     def create_project(self, name: str, description: str, owner_id: int) -> Project:
         """Создать новый проект.
@@ -48,7 +118,8 @@ class ProjectService:
             description=description,
             owner_id=owner_id
         )
-        self.project_repo.add(project)
+        with transaction(self.uow):
+            self.project_repo.add(project)
         
         return project
     
@@ -71,6 +142,33 @@ class ProjectService:
         """
         return self.project_repo.get_all()
     
+    def get_projects_created_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Project]:
+        """Получить проекты, созданные в полуинтервале [start, end).
+        
+        Args:
+            start: Начало интервала (None - без ограничения)
+            end: Конец интервала, не включается (None - без ограничения)
+        
+        Returns:
+            Список проектов в порядке создания
+        """
+        return self.project_repo.find_created_between(start, end)
+    
+    def get_latest_projects(self, count: int) -> List[Project]:
+        """Получить последние созданные проекты.
+        
+        Args:
+            count: Количество проектов
+        
+        Returns:
+            Список проектов, от самого нового к самому старому
+        """
+        return self.project_repo.find_latest(count)
+    
     def delete_project(self, project_id: int, user_id: int) -> None:
         """Удалить проект.
         
@@ -93,7 +191,8 @@ class ProjectService:
         if project.owner_id != user_id and user.role != "admin":
             raise ValueError("Только владелец или администратор может удалить проект")
         
-        self.project_repo.delete(project_id)
+        with transaction(self.uow):
+            self.project_repo.delete(project_id)
     
     def get_project_progress(self, project_id: int) -> float:
         """Получить прогресс выполнения проекта.
@@ -112,3 +211,107 @@ class ProjectService:
             raise ValueError(f"Проект с ID {project_id} не найден")
         
         return project.calculate_progress()
+    
+    def get_portfolio_progress(
+        self,
+        project_ids: Optional[Iterable[int]] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 256,
+        parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD
+    ) -> Dict[int, ProjectProgress]:
+        """Получить прогресс и количество задач по статусам для портфеля проектов.
+        
+        Небольшие портфели считаются в текущем процессе. Если задач не
+        меньше ``parallel_threshold``, проекты разбиваются на блоки и
+        обрабатываются в пуле процессов, получивших данные через fork
+        (без сериализации задач). Пул создается один раз и используется
+        повторно, пока в репозиториях проектов и задач нет записей; без
+        ``task_repo`` изменения задач не отслеживаются, и пул создается
+        заново при каждом вызове. Если fork недоступен или в процессе
+        работают другие потоки (fork небезопасен), подсчет выполняется
+        в текущем процессе.
+        
+        Args:
+            project_ids: ID проектов (None - все проекты)
+            max_workers: Количество процессов (None - по числу ядер)
+            chunk_size: Количество проектов в одном блоке
+            parallel_threshold: Минимальное число задач для подсчета в пуле
+        
+        Returns:
+            Словарь {ID проекта: прогресс проекта}
+        
+        Raises:
+            ValueError: Если проект не найден
+        """
+        if project_ids is None:
+            projects = self.project_repo.get_all()
+        else:
+            projects = []
+            for project_id in project_ids:
+                project = self.project_repo.get_by_id(project_id)
+                if not project:
+                    raise ValueError(f"Проект с ID {project_id} не найден")
+                projects.append(project)
+        
+        chunks = [projects[i:i + chunk_size] for i in range(0, len(projects), chunk_size)]
+        pool = None
+        if (
+            max_workers != 1
+            and len(chunks) > 1
+            and sum(len(p.tasks) for p in projects) >= parallel_threshold
+        ):
+            pool = self._snapshot_pool(max_workers)
+        
+        if pool is not None:
+            counted = pool.map(_count_forked_chunk, [[p.id for p in chunk] for chunk in chunks])
+        else:
+            counted = map(_count_statuses, chunks)
+        
+        result: Dict[int, ProjectProgress] = {}
+        for chunk in counted:
+            for project_id, counts in chunk:
+                status_counts = dict(zip(_STATUSES, counts))
+                total = sum(counts)
+                completed = status_counts[TaskStatus.COMPLETED]
+                result[project_id] = ProjectProgress(
+                    project_id=project_id,
+                    total=total,
+                    progress=(completed / total) * 100 if total else 0.0,
+                    status_counts=status_counts
+                )
+        return result
+    
+    def close(self) -> None:
+        """Остановить пул процессов подсчета прогресса."""
+        global _forked_projects
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            _forked_projects = {}
+    
+    def _on_change(self, entity_id: int, entity: Optional[object]) -> None:
+        self._generation += 1
+    
+    def _snapshot_pool(self, max_workers: Optional[int]) -> Optional[ProcessPoolExecutor]:
+        """Получить пул, процессы которого видят текущее состояние проектов."""
+        global _forked_projects
+        
+        if (
+            self._pool is not None
+            and self.task_repo is not None
+            and self._pool_generation == self._generation
+            and self._pool_workers == max_workers
+        ):
+            return self._pool
+        self.close()
+        
+        # После остановки пула его служебный поток завершен, и других
+        # потоков быть не должно: fork копирует только вызывающий поток
+        if "fork" not in multiprocessing.get_all_start_methods() or threading.active_count() > 1:
+            return None
+        _forked_projects = {p.id: p for p in self.project_repo.get_all()}
+        context = multiprocessing.get_context("fork")
+        self._pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        self._pool_generation = self._generation
+        self._pool_workers = max_workers
+        return self._pool
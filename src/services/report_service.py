@@ -0,0 +1,159 @@
+"""Сервис аналитических отчетов по задачам."""
+from datetime import datetime, timedelta
+from typing import Any, Dict, NamedTuple, Optional
+from src.models.task import Task, TaskStatus, Priority
+from src.repositories.task_repository import TaskRepository
+
+
+def _add(buckets: Dict[datetime, Dict[Any, int]], bucket: datetime, key: Any, delta: int) -> None:
+    """Изменить счетчик корзины, удаляя опустевшие записи."""
+    counts = buckets.setdefault(bucket, {})
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        del counts[key]
+        if not counts:
+            del buckets[bucket]
+
+
+class _Contribution(NamedTuple):
+    """Вклад задачи в агрегаты отчетов."""
+    created_bucket: datetime
+    project_id: int
+    completed_bucket: Optional[datetime]
+    assignee_id: Optional[int]
+    status: TaskStatus
+    priority: Priority
+
+
+class ReportService:
+    """Сервис отчетов с агрегатами по временным интервалам (корзинам).
+    
+    Агрегаты строятся один раз при создании сервиса, а затем
+    поддерживаются инкрементально: сервис подписан на изменения
+    репозитория задач и при каждой записи вычитает прежний вклад задачи
+    и добавляет новый. Поэтому отчет не просматривает задачи и всегда
+    отражает задним числом импортированные, удаленные и переоткрытые
+    задачи.
+    """
+    
+    def __init__(self, task_repo: TaskRepository, bucket_size: timedelta = timedelta(days=1)):
+        """Инициализация сервиса.
+        
+        Args:
+            task_repo: Репозиторий задач
+            bucket_size: Размер временной корзины (по умолчанию сутки)
+        """
+        if bucket_size <= timedelta(0):
+            raise ValueError("Размер корзины должен быть положительным")
+        self.task_repo = task_repo
+        self.bucket_size = bucket_size
+        # Начало корзины -> {ключ: количество}
+        self._created: Dict[datetime, Dict[int, int]] = {}
+        self._completed: Dict[datetime, Dict[Optional[int], int]] = {}
+        self._matrix = {status: {priority: 0 for priority in Priority} for status in TaskStatus}
+        self._contributions: Dict[int, _Contribution] = {}
+        
+        for task in task_repo.get_all():
+            self._on_change(task.id, task)
+        task_repo.subscribe(self._on_change)
+    
+    def bucket_start(self, moment: datetime) -> datetime:
+        """Получить начало корзины, в которую попадает момент времени.
+        
+        Args:
+            moment: Момент времени
+        
+        Returns:
+            Начало корзины
+        """
+        return datetime.min + ((moment - datetime.min) // self.bucket_size) * self.bucket_size
+    
+    def build_report(self) -> Dict[str, Dict]:
+        """Построить все отчеты по накопленным агрегатам.
+        
+        Returns:
+            Словарь с ключами:
+            ``created`` - {начало корзины: {ID проекта: создано задач}},
+            ``completed`` - {начало корзины: {ID исполнителя: завершено задач}},
+            ``matrix`` - {статус: {приоритет: количество задач}}
+        """
+        return {
+            "created": {bucket: dict(counts) for bucket, counts in sorted(self._created.items())},
+            "completed": {bucket: dict(counts) for bucket, counts in sorted(self._completed.items())},
+            "matrix": {status: dict(row) for status, row in self._matrix.items()},
+        }
+    
+    def _on_change(self, task_id: int, task: Optional[Task]) -> None:
+        """Пересчитать вклад задачи после записи в репозиторий."""
+        previous = self._contributions.pop(task_id, None)
+        if previous is not None:
+            self._apply(previous, -1)
+        if task is not None:
+            contribution = _Contribution(
+                self.bucket_start(task.created_at),
+                task.project_id,
+                None if task.completed_at is None else self.bucket_start(task.completed_at),
+                task.assignee_id,
+                task.status,
+                task.priority
+            )
+            self._contributions[task_id] = contribution
+            self._apply(contribution, 1)
+    
+    def _apply(self, contribution: _Contribution, delta: int) -> None:
+        self._matrix[contribution.status][contribution.priority] += delta
+        _add(self._created, contribution.created_bucket, contribution.project_id, delta)
+        if contribution.completed_bucket is not None:
+            _add(self._completed, contribution.completed_bucket, contribution.assignee_id, delta)
+    
+    def tasks_created_per_bucket(
+        self,
+        project_id: Optional[int] = None
+    ) -> Dict[datetime, Dict[int, int]]:
+        """Получить количество созданных задач по корзинам и проектам.
+        
+        Args:
+            project_id: ID проекта для фильтрации (None - все проекты)
+        
+        Returns:
+            {начало корзины: {ID проекта: количество}}
+        """
+        created = self.build_report()["created"]
+        if project_id is None:
+            return created
+        return {
+            bucket: {project_id: counts[project_id]}
+            for bucket, counts in created.items()
+            if project_id in counts
+        }
+    
+    def completion_throughput(
+        self,
+        assignee_id: Optional[int] = None
+    ) -> Dict[datetime, Dict[Optional[int], int]]:
+        """Получить количество завершенных задач по корзинам и исполнителям.
+        
+        Args:
+            assignee_id: ID исполнителя для фильтрации (None - все исполнители)
+        
+        Returns:
+            {начало корзины: {ID исполнителя: количество}}
+        """
+        completed = self.build_report()["completed"]
+        if assignee_id is None:
+            return completed
+        return {
+            bucket: {assignee_id: counts[assignee_id]}
+            for bucket, counts in completed.items()
+            if assignee_id in counts
+        }
+    
+    def status_priority_matrix(self) -> Dict[TaskStatus, Dict[Priority, int]]:
+        """Получить матрицу «статус × приоритет» по всем проектам.
+        
+        Returns:
+            {статус: {приоритет: количество задач}}
+        """
+        return self.build_report()["matrix"]
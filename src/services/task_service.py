@@ -1,19 +1,29 @@
 """Сервис для работы с задачами."""
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
 from src.models.task import Task, TaskStatus, Priority
 from src.repositories.task_repository import TaskRepository
 from src.repositories.project_repository import ProjectRepository
 from src.repositories.user_repository import UserRepository
+from src.repositories.unit_of_work import UnitOfWork, after_commit, transaction
+from src.services.deadline_tracker import DeadlineTracker
 
 
 class TaskService:
-    """Сервис для управления задачами."""
+    """Сервис для управления задачами.
+    
+    Трекер сроков заполняется задачами репозитория при первом обращении
+    к нему, а изменения таймеров применяются только после фиксации
+    единицы работы.
+    """
     
     def __init__(
         self,
         task_repo: TaskRepository,
         project_repo: ProjectRepository,
-        user_repo: UserRepository
+        user_repo: UserRepository,
+        uow: Optional[UnitOfWork] = None,
+        deadline_tracker: Optional[DeadlineTracker] = None
     ):
         """Инициализация сервиса.
         
@@ -21,10 +31,16 @@ class TaskService:
             task_repo: Репозиторий задач
             project_repo: Репозиторий проектов
             user_repo: Репозиторий пользователей
+            uow: Единица работы для пакетной фиксации изменений
+            deadline_tracker: Трекер сроков задач; при первом обращении
+                заполняется сроками задач, уже находящихся в репозитории
         """
         self.task_repo = task_repo
         self.project_repo = project_repo
         self.user_repo = user_repo
+        self.uow = uow
+        self.deadline_tracker = deadline_tracker or DeadlineTracker()
+        self._deadlines_loaded = False
     
     def create_task(
         self,
@@ -47,28 +63,29 @@ class TaskService:
         Raises:
             ValueError: Если проект не существует
         """
-        # Проверка существования проекта
-        project = self.project_repo.get_by_id(project_id)
-        if not project:
-            raise ValueError(f"Проект с ID {project_id} не найден")
-        
-        # Валидация данных
-        if not title or len(title.strip()) == 0:
-            raise ValueError("Заголовок задачи не может быть пустым")
-        
-        # Создание задачи
-        task = Task(
-            task_id=None,
-            title=title,
-            description=description,
-            project_id=project_id,
-            priority=priority
-        )
-        self.task_repo.add(task)
-        
-        # Добавление задачи в проект
-        project.add_task(task)
-        self.project_repo.update(project)
+        with transaction(self.uow):
+            # Проверка существования проекта
+            project = self.project_repo.get_by_id(project_id)
+            if not project:
+                raise ValueError(f"Проект с ID {project_id} не найден")
+            
+            # Валидация данных
+            if not title or len(title.strip()) == 0:
+                raise ValueError("Заголовок задачи не может быть пустым")
+            
+            # Создание задачи
+            task = Task(
+                task_id=None,
+                title=title,
+                description=description,
+                project_id=project_id,
+                priority=priority
+            )
+            self.task_repo.add(task)
+            
+            # Добавление задачи в проект
+            project.add_task(task)
+            self.project_repo.update(project)
         
         return task
     
@@ -82,16 +99,19 @@ class TaskService:
         Raises:
             ValueError: Если задача или пользователь не найдены
         """
-        task = self.task_repo.get_by_id(task_id)
-        if not task:
-            raise ValueError(f"Задача с ID {task_id} не найдена")
-        
-        user = self.user_repo.get_by_id(user_id)
-        if not user:
-            raise ValueError(f"Пользователь с ID {user_id} не найден")
+        with transaction(self.uow):
+            task = self.task_repo.get_by_id(task_id)
+            if not task:
+                raise ValueError(f"Задача с ID {task_id} не найдена")
+            
+            user = self.user_repo.get_by_id(user_id)
+            if not user:
+                raise ValueError(f"Пользователь с ID {user_id} не найден")
+            
+            task.assign_to(user_id)
+            self.task_repo.update(task)
         
-        task.assign_to(user_id)
-        self.task_repo.update(task)
+        after_commit(self.uow, lambda: self._deadlines().update_assignee(task))
     
     def update_task_status(self, task_id: int, status: TaskStatus) -> None:
         """Изменить статус задачи.
@@ -103,12 +123,77 @@ class TaskService:
         Raises:
             ValueError: Если задача не найдена
         """
-        task = self.task_repo.get_by_id(task_id)
-        if not task:
-            raise ValueError(f"Задача с ID {task_id} не найдена")
+        with transaction(self.uow):
+            task = self.task_repo.get_by_id(task_id)
+            if not task:
+                raise ValueError(f"Задача с ID {task_id} не найдена")
+            
+            was_completed = task.status == TaskStatus.COMPLETED
+            task.change_status(status)
+            self.task_repo.update(task)
+        
+        # Таймеры сроков меняются только при завершении или переоткрытии задачи
+        if status == TaskStatus.COMPLETED:
+            after_commit(self.uow, lambda: self._deadlines().cancel(task_id))
+        elif was_completed:
+            after_commit(self.uow, lambda: self._deadlines().schedule(task))
+    
+    def set_due_date(self, task_id: int, due_date: Optional[datetime]) -> None:
+        """Установить срок выполнения задачи.
+        
+        Args:
+            task_id: ID задачи
+            due_date: Срок или None, чтобы снять срок
+        
+        Raises:
+            ValueError: Если задача не найдена
+        """
+        with transaction(self.uow):
+            task = self.task_repo.get_by_id(task_id)
+            if not task:
+                raise ValueError(f"Задача с ID {task_id} не найдена")
+            
+            task.set_due_date(due_date)
+            self.task_repo.update(task)
+        
+        after_commit(self.uow, lambda: self._deadlines().schedule(task))
+    
+    def check_deadlines(self, now: Optional[datetime] = None) -> List[Tuple[str, int]]:
+        """Обработать наступившие сроки задач.
+        
+        Args:
+            now: Текущий момент (по умолчанию datetime.now())
+        
+        Returns:
+            События (вид события, ID задачи): ``due_soon`` или ``overdue``
+        """
+        return self._deadlines().advance(now)
+    
+    def get_overdue_tasks_by_project(self, project_id: int) -> List[Task]:
+        """Получить просроченные задачи проекта на текущий момент.
+        
+        Args:
+            project_id: ID проекта
+        
+        Returns:
+            Список задач
+        """
+        tracker = self._deadlines()
+        tracker.advance()
+        return self._get_tasks(tracker.overdue_by_project(project_id))
+    
+    def get_overdue_tasks_by_user(self, user_id: int) -> List[Task]:
+        """Получить просроченные задачи пользователя на текущий момент.
+        
+        Args:
+            user_id: ID пользователя
         
-        task.change_status(status)
-        self.task_repo.update(task)
+        Returns:
+            Список задач
+        """
+        tracker = self._deadlines()
+        tracker.advance()
+        return self._get_tasks(tracker.overdue_by_assignee(user_id))
     
     def get_task(self, task_id: int) -> Optional[Task]:
         """Получить задачу по ID.
@@ -142,3 +227,41 @@ class TaskService:
             Список задач
         """
         return self.task_repo.find_by_assignee(user_id)
+    
+    def get_tasks_created_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Task]:
+        """Получить задачи, созданные в полуинтервале [start, end).
+        
+        Args:
+            start: Начало интервала (None - без ограничения)
+            end: Конец интервала, не включается (None - без ограничения)
+        
+        Returns:
+            Список задач в порядке создания
+        """
+        return self.task_repo.find_created_between(start, end)
+    
+    def get_latest_tasks(self, count: int) -> List[Task]:
+        """Получить последние созданные задачи.
+        
+        Args:
+            count: Количество задач
+        
+        Returns:
+            Список задач, от самой новой к самой старой
+        """
+        return self.task_repo.find_latest(count)
+    
+    def _deadlines(self) -> DeadlineTracker:
+        """Трекер сроков; при первом обращении в него загружаются сроки задач репозитория."""
+        if not self._deadlines_loaded:
+            self._deadlines_loaded = True
+            self.deadline_tracker.bootstrap(self.task_repo.find_open_with_due_date())
+        return self.deadline_tracker
+    
+    def _get_tasks(self, task_ids: Iterable[int]) -> List[Task]:
+        tasks = (self.task_repo.get_by_id(task_id) for task_id in sorted(task_ids))
+        return [task for task in tasks if task is not None]
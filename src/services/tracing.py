@@ -0,0 +1,408 @@
+"""Запись и воспроизведение трасс вызовов сервисов.
+
+Запись включается оберткой ``TraceRecorder.wrap`` над сервисами
+(в CLI - переменной окружения ``TASK_TRACE=<файл>``). Трасса - компактный
+двоичный файл: имена методов хранятся один раз в таблице строк, для
+каждого вызова записываются метка времени, длительность, исход и
+сериализованные аргументы.
+
+Воспроизведение и сравнение сборок:
+    python -m src.services.tracing replay trace.bin --out build_a.json
+    python -m src.services.tracing replay trace.bin --pacing original --out build_b.json
+    python -m src.services.tracing compare build_a.json build_b.json
+"""
+import argparse
+import collections.abc
+import json
+import pickle
+import struct
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from src.benchmarks.load_test import percentile
+from src.repositories.project_repository import ProjectRepository
+from src.repositories.task_repository import TaskRepository
+from src.repositories.user_repository import UserRepository
+from src.services.project_service import ProjectService
+from src.services.task_service import TaskService
+from src.services.user_service import UserService
+
+_MAGIC = b"SVCTRC01"
+_KIND = struct.Struct("<BH")  # вид записи, ID имени
+_NAME_LENGTH = struct.Struct("<H")
+_CALL = struct.Struct("<ddBI")  # смещение, длительность, исход, длина аргументов
+_DEFINE, _INVOKE = 0, 1
+_OK, _ERROR = 0, 1
+
+
+class TraceCall(NamedTuple):
+    """Вызов метода сервиса из трассы."""
+    service: str
+    method: str
+    offset: float  # Секунды от начала записи
+    duration: float
+    ok: bool
+    args: tuple
+    kwargs: Dict[str, Any]
+
+
+class Unrecorded(NamedTuple):
+    """Заглушка аргументов вызова, которые не удалось сериализовать."""
+    text: str  # repr исходных аргументов
+
+
+class TraceRecorder:
+    """Запись вызовов сервисов в двоичную трассу.
+    
+    Ошибки записи не прерывают вызов сервиса: несериализуемые аргументы
+    заменяются заглушкой ``Unrecorded``, а вызовы, которые не удалось
+    записать, учитываются в счетчике ``dropped``.
+    """
+    
+    def __init__(self, path: str):
+        """Открыть файл трассы для записи.
+        
+        Args:
+            path: Путь к файлу трассы
+        """
+        self.path = path
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(_MAGIC)
+        self._names: Dict[str, int] = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.dropped = 0
+    
+    def wrap(self, service: Any, name: str) -> "RecordingProxy":
+        """Обернуть сервис, записывая вызовы его публичных методов.
+        
+        Args:
+            service: Сервис
+            name: Имя сервиса в трассе (user, project или task)
+        
+        Returns:
+            Прокси с тем же интерфейсом, что и сервис
+        """
+        return RecordingProxy(service, name, self)
+    
+    def record(
+        self,
+        service: str,
+        method: str,
+        started: float,
+        duration: float,
+        ok: bool,
+        args: tuple,
+        kwargs: Dict[str, Any]
+    ) -> None:
+        """Записать вызов в трассу.
+        
+        Args:
+            service: Имя сервиса
+            method: Имя метода
+            started: Момент начала вызова (time.perf_counter)
+            duration: Длительность вызова в секундах
+            ok: Завершился ли вызов без исключения
+            args: Позиционные аргументы
+            kwargs: Именованные аргументы
+        """
+        try:
+            payload = pickle.dumps((args, kwargs), pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            placeholder = (Unrecorded(repr((args, kwargs))),)
+            payload = pickle.dumps((placeholder, {}), pickle.HIGHEST_PROTOCOL)
+        key = f"{service}.{method}"
+        with self._lock:
+            name_id = self._names.get(key)
+            if name_id is None:
+                name_id = self._names[key] = len(self._names)
+                encoded = key.encode("utf-8")
+                self._file.write(_KIND.pack(_DEFINE, name_id))
+                self._file.write(_NAME_LENGTH.pack(len(encoded)))
+                self._file.write(encoded)
+            self._file.write(_KIND.pack(_INVOKE, name_id))
+            self._file.write(_CALL.pack(
+                started - self._origin, duration, _OK if ok else _ERROR, len(payload)))
+            self._file.write(payload)
+    
+    def close(self) -> None:
+        """Закрыть файл трассы."""
+        with self._lock:
+            self._file.close()
+
+
+class RecordingProxy:
+    """Прокси сервиса, записывающий вызовы публичных методов."""
+    
+    def __init__(self, service: Any, name: str, recorder: TraceRecorder):
+        self._service = service
+        self._name = name
+        self._recorder = recorder
+    
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._service, attr)
+        if attr.startswith("_") or not callable(value):
+            return value
+        
+        def recorded(*args, **kwargs):
+            # Итераторы читаются один раз: сервис и трасса получают один и тот же список
+            args = tuple(_materialize(arg) for arg in args)
+            kwargs = {key: _materialize(arg) for key, arg in kwargs.items()}
+            started = time.perf_counter()
+            try:
+                result = value(*args, **kwargs)
+            except Exception:
+                self._record(attr, started, False, args, kwargs)
+                raise
+            self._record(attr, started, True, args, kwargs)
+            return result
+        return recorded
+    
+    def _record(self, method: str, started: float, ok: bool, args: tuple, kwargs: Dict[str, Any]) -> None:
+        try:
+            self._recorder.record(
+                self._name, method, started, time.perf_counter() - started, ok, args, kwargs)
+        except Exception:
+            self._recorder.dropped += 1
+
+
+def _materialize(value: Any) -> Any:
+    if isinstance(value, collections.abc.Iterator):
+        return list(value)
+    return value
+
+
+def _read_exact(f: BinaryIO, size: int) -> Optional[bytes]:
+    data = f.read(size)
+    return data if len(data) == size else None
+
+
+def read_trace(path: str) -> Iterator[TraceCall]:
+    """Прочитать вызовы из файла трассы.
+    
+    Args:
+        path: Путь к файлу трассы
+    
+    Yields:
+        Вызовы в порядке записи; незавершенная последняя запись
+        (трасса прервана во время записи) пропускается
+    
+    Raises:
+        ValueError: Если файл не является трассой
+    """
+    names: Dict[int, Tuple[str, str]] = {}
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Файл {path} не является трассой вызовов")
+        while True:
+            head = _read_exact(f, _KIND.size)
+            if head is None:
+                return
+            kind, name_id = _KIND.unpack(head)
+            if kind == _DEFINE:
+                size = _read_exact(f, _NAME_LENGTH.size)
+                if size is None:
+                    return
+                encoded = _read_exact(f, _NAME_LENGTH.unpack(size)[0])
+                if encoded is None:
+                    return
+                service, _, method = encoded.decode("utf-8").partition(".")
+                names[name_id] = (service, method)
+                continue
+            call = _read_exact(f, _CALL.size)
+            if call is None:
+                return
+            offset, duration, outcome, length = _CALL.unpack(call)
+            payload = _read_exact(f, length)
+            if payload is None:
+                return
+            args, kwargs = pickle.loads(payload)
+            service, method = names[name_id]
+            yield TraceCall(service, method, offset, duration, outcome == _OK, args, kwargs)
+
+
+def create_services(
+    user_repo: Optional[UserRepository] = None,
+    project_repo: Optional[ProjectRepository] = None,
+    task_repo: Optional[TaskRepository] = None
+) -> Dict[str, Any]:
+    """Создать сервисы для воспроизведения (по умолчанию - на пустом хранилище).
+    
+    Returns:
+        {имя сервиса: сервис}
+    """
+    user_repo = user_repo or UserRepository()
+    project_repo = project_repo or ProjectRepository()
+    task_repo = task_repo or TaskRepository()
+    return {
+        "user": UserService(user_repo),
+        "project": ProjectService(project_repo, user_repo, task_repo=task_repo),
+        "task": TaskService(task_repo, project_repo, user_repo),
+    }
+
+
+def save_snapshot(
+    user_repo: UserRepository,
+    project_repo: ProjectRepository,
+    task_repo: TaskRepository,
+    path: str
+) -> None:
+    """Сохранить снимок хранилища для последующего воспроизведения.
+    
+    Args:
+        user_repo: Репозиторий пользователей
+        project_repo: Репозиторий проектов
+        task_repo: Репозиторий задач
+        path: Путь к файлу снимка
+    """
+    with open(path, "wb") as f:
+        pickle.dump((user_repo, project_repo, task_repo), f, pickle.HIGHEST_PROTOCOL)
+
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+    """Создать сервисы над хранилищем, восстановленным из снимка.
+    
+    Args:
+        path: Путь к файлу снимка
+    
+    Returns:
+        {имя сервиса: сервис}
+    """
+    with open(path, "rb") as f:
+        user_repo, project_repo, task_repo = pickle.load(f)
+    return create_services(user_repo, project_repo, task_repo)
+
+
+def replay(
+    calls: Iterator[TraceCall],
+    services: Dict[str, Any],
+    pacing: str = "fast",
+    speed: float = 1.0
+) -> Dict[str, Dict[str, float]]:
+    """Воспроизвести трассу и собрать статистику по методам.
+    
+    Args:
+        calls: Вызовы из трассы
+        services: {имя сервиса: сервис}
+        pacing: ``fast`` - без пауз, ``original`` - с исходными интервалами
+        speed: Ускорение воспроизведения для режима ``original``
+    
+    Returns:
+        {"сервис.метод": {count, errors, mismatches, skipped, total, mean, p50, p95}},
+        где mismatches - вызовы, исход которых отличается от записанного,
+        skipped - вызовы с несохраненными аргументами (не воспроизводятся);
+        перцентили считаются методом ближайшего ранга, как в нагрузочном тесте
+    """
+    if pacing not in ("fast", "original"):
+        raise ValueError("Режим воспроизведения должен быть 'fast' или 'original'")
+    timings: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    mismatches: Dict[str, int] = {}
+    skipped: Dict[str, int] = {}
+    origin = time.perf_counter()
+    
+    for call in calls:
+        if pacing == "original":
+            delay = call.offset / speed - (time.perf_counter() - origin)
+            if delay > 0:
+                time.sleep(delay)
+        key = f"{call.service}.{call.method}"
+        if call.args and isinstance(call.args[0], Unrecorded):
+            skipped[key] = skipped.get(key, 0) + 1
+            continue
+        method = getattr(services[call.service], call.method)
+        started = time.perf_counter()
+        ok = True
+        try:
+            method(*call.args, **call.kwargs)
+        except Exception:
+            ok = False
+        timings.setdefault(key, []).append(time.perf_counter() - started)
+        errors[key] = errors.get(key, 0) + (0 if ok else 1)
+        mismatches[key] = mismatches.get(key, 0) + (0 if ok == call.ok else 1)
+    
+    report = {}
+    for key in sorted(set(timings) | set(skipped)):
+        values = sorted(timings.get(key, [])) or [0.0]
+        report[key] = {
+            "count": len(timings.get(key, [])),
+            "errors": errors.get(key, 0),
+            "mismatches": mismatches.get(key, 0),
+            "skipped": skipped.get(key, 0),
+            "total": sum(values),
+            "mean": sum(values) / len(values),
+            "p50": percentile(values, 0.50),
+            "p95": percentile(values, 0.95),
+        }
+    return report
+
+
+def compare_reports(
+    baseline: Dict[str, Dict[str, float]],
+    candidate: Dict[str, Dict[str, float]]
+) -> Dict[str, Dict[str, float]]:
+    """Сравнить отчеты воспроизведения двух сборок.
+    
+    Args:
+        baseline: Отчет базовой сборки
+        candidate: Отчет проверяемой сборки
+    
+    Returns:
+        {"сервис.метод": {mean_before, mean_after, mean_ratio, p95_before, p95_after, p95_ratio}}
+        для методов, присутствующих в обоих отчетах
+    """
+    result = {}
+    for key in sorted(set(baseline) & set(candidate)):
+        before, after = baseline[key], candidate[key]
+        result[key] = {
+            "mean_before": before["mean"],
+            "mean_after": after["mean"],
+            "mean_ratio": after["mean"] / before["mean"] if before["mean"] else float("inf"),
+            "p95_before": before["p95"],
+            "p95_after": after["p95"],
+            "p95_ratio": after["p95"] / before["p95"] if before["p95"] else float("inf"),
+        }
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа утилиты воспроизведения."""
+    parser = argparse.ArgumentParser(description="Воспроизведение трасс вызовов сервисов")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    replay_parser = commands.add_parser("replay", help="Воспроизвести трассу")
+    replay_parser.add_argument("trace")
+    replay_parser.add_argument("--pacing", choices=("fast", "original"), default="fast")
+    replay_parser.add_argument("--speed", type=float, default=1.0)
+    replay_parser.add_argument("--snapshot", help="Снимок хранилища (по умолчанию - пустое)")
+    replay_parser.add_argument("--out", help="Сохранить отчет в JSON")
+    
+    compare_parser = commands.add_parser("compare", help="Сравнить два отчета")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    args = parser.parse_args(argv)
+    
+    if args.command == "replay":
+        services = load_snapshot(args.snapshot) if args.snapshot else create_services()
+        report = replay(read_trace(args.trace), services, args.pacing, args.speed)
+        print(f"{'Метод':<36}{'вызовов':>9}{'ошибок':>8}{'расхожд.':>10}{'пропущ.':>9}{'mean, мс':>11}{'p95, мс':>11}")
+        for key, stats in report.items():
+            print(f"{key:<36}{stats['count']:>9}{stats['errors']:>8}{stats['mismatches']:>10}"
+                  f"{stats['skipped']:>9}{stats['mean'] * 1000:>11.4f}{stats['p95'] * 1000:>11.4f}")
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    else:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.candidate, encoding="utf-8") as f:
+            candidate = json.load(f)
+        print(f"{'Метод':<36}{'mean до':>11}{'mean после':>12}{'x':>7}{'p95 до':>11}{'p95 после':>12}{'x':>7}")
+        for key, diff in compare_reports(baseline, candidate).items():
+            print(f"{key:<36}{diff['mean_before'] * 1000:>11.4f}{diff['mean_after'] * 1000:>12.4f}"
+                  f"{diff['mean_ratio']:>7.2f}{diff['p95_before'] * 1000:>11.4f}"
+                  f"{diff['p95_after'] * 1000:>12.4f}{diff['p95_ratio']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,21 @@
 from typing import List, Optional
 from src.models.user import User
 from src.repositories.user_repository import UserRepository
+from src.repositories.unit_of_work import UnitOfWork, transaction
 
 
 class UserService:
     """Сервис для управления пользователями."""
     
-    def __init__(self, user_repo: UserRepository):
+    def __init__(self, user_repo: UserRepository, uow: Optional[UnitOfWork] = None):
         """Инициализация сервиса.
         
         Args:
             user_repo: Репозиторий пользователей
+            uow: Единица работы для пакетной фиксации изменений
         """
         self.user_repo = user_repo
+        self.uow = uow
     
     def register_user(self, name: str, email: str, role: str = "member") -> User:
         """Зарегистрировать нового пользователя.
@@ -40,7 +43,8 @@ class UserService:
         
         # Создание пользователя
         user = User(user_id=None, name=name, email=email, role=role)
-        self.user_repo.add(user)
+        with transaction(self.uow):
+            self.user_repo.add(user)
         
         return user
     
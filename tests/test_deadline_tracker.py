@@ -0,0 +1,160 @@
+"""Тесты колеса таймеров и трекера сроков задач."""
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.project import Project
+from src.models.task import Task, TaskStatus
+from src.models.user import User
+from src.repositories.mmap_task_repository import MmapTaskRepository
+from src.repositories.project_repository import ProjectRepository
+from src.repositories.task_repository import TaskRepository
+from src.repositories.unit_of_work import UnitOfWork
+from src.repositories.user_repository import UserRepository
+from src.services.deadline_tracker import DUE_SOON, OVERDUE, DeadlineTracker, TimingWheel
+from src.services.task_service import TaskService
+
+BASE = datetime(2026, 1, 1)
+TICK = timedelta(minutes=1)
+
+
+def make_task(task_id, due_date, project_id=1, assignee_id=None):
+    task = Task(task_id, f"задача {task_id}", "", project_id)
+    task.set_due_date(due_date)
+    if assignee_id is not None:
+        task.assign_to(assignee_id)
+    return task
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_wheel_matches_brute_force(seed):
+    """Колесо выдает те же таймеры, что и полный перебор, включая переполнение."""
+    rng = random.Random(seed)
+    wheel = TimingWheel(tick=TICK, slots=4, levels=2, start=BASE)
+    pending = {}  # ключ -> тик срабатывания
+    current = 0
+    for _ in range(2000):
+        action = rng.random()
+        if action < 0.5:
+            key = rng.randrange(200)
+            moment = BASE + timedelta(seconds=rng.randrange((current - 5) * 60, (current + 100) * 60))
+            wheel.schedule(key, moment, payload=key)
+            pending[key] = math.ceil((moment - BASE) / TICK)
+        elif action < 0.7:
+            key = rng.randrange(200)
+            assert wheel.cancel(key) == (pending.pop(key, None) is not None)
+        else:
+            now = BASE + timedelta(seconds=rng.randrange((current - 5) * 60, (current + 40) * 60))
+            current = max(current, math.floor((now - BASE) / TICK))
+            expected = {key for key, deadline in pending.items() if deadline <= current}
+            fired = wheel.advance(now)
+            assert len(fired) == len(expected)
+            assert {key for key, _ in fired} == expected
+            assert all(key == payload for key, payload in fired)
+            for key in expected:
+                del pending[key]
+        assert len(wheel) == len(pending)
+
+
+def test_tracker_fires_due_soon_then_overdue():
+    """Сначала срабатывает «скоро срок», затем просрочка с индексами."""
+    tracker = DeadlineTracker(due_soon_window=timedelta(hours=2), start=BASE)
+    tracker.schedule(make_task(1, BASE + timedelta(hours=3), project_id=7, assignee_id=5))
+    
+    assert tracker.advance(BASE + timedelta(minutes=59)) == []
+    assert tracker.advance(BASE + timedelta(hours=1)) == [(DUE_SOON, 1)]
+    assert tracker.due_soon() == {1}
+    assert tracker.advance(BASE + timedelta(hours=3)) == [(OVERDUE, 1)]
+    assert tracker.due_soon() == set()
+    assert tracker.overdue_by_project(7) == {1}
+    assert tracker.overdue_by_assignee(5) == {1}
+
+
+def test_tracker_cancel_reschedule_and_assignee():
+    """Завершение снимает задачу, перенос срока и смена исполнителя учитываются."""
+    tracker = DeadlineTracker(due_soon_window=timedelta(0), start=BASE)
+    done = make_task(1, BASE + timedelta(hours=1))
+    moved = make_task(2, BASE + timedelta(hours=1), assignee_id=5)
+    tracker.schedule(done)
+    tracker.schedule(moved)
+    
+    done.change_status(TaskStatus.COMPLETED)
+    tracker.schedule(done)
+    moved.set_due_date(BASE + timedelta(hours=5))
+    tracker.schedule(moved)
+    assert tracker.advance(BASE + timedelta(hours=2)) == []
+    
+    tracker.advance(BASE + timedelta(hours=5))
+    assert tracker.overdue_by_assignee(5) == {2}
+    moved.assign_to(6)
+    tracker.update_assignee(moved)
+    assert tracker.overdue_by_assignee(5) == set()
+    assert tracker.overdue_by_assignee(6) == {2}
+    
+    tracker.cancel(2)
+    assert tracker.overdue_by_project(1) == set()
+
+
+def test_service_queries_advance_to_now():
+    """Запросы просроченных задач учитывают сроки без вызова check_deadlines."""
+    user_repo, project_repo, task_repo = UserRepository(), ProjectRepository(), TaskRepository()
+    user_repo.add(User(None, "user", "user@example.com"))
+    project_repo.add(Project(None, "проект", "", owner_id=1))
+    tracker = DeadlineTracker(start=datetime.now() - timedelta(hours=2))
+    service = TaskService(task_repo, project_repo, user_repo, deadline_tracker=tracker)
+    
+    task = service.create_task("задача", "", 1)
+    service.assign_task(task.id, 1)
+    service.set_due_date(task.id, datetime.now() - timedelta(hours=1))
+    
+    assert [t.id for t in service.get_overdue_tasks_by_project(1)] == [task.id]
+    assert [t.id for t in service.get_overdue_tasks_by_user(1)] == [task.id]
+    
+    service.update_task_status(task.id, TaskStatus.COMPLETED)
+    assert service.get_overdue_tasks_by_project(1) == []
+
+
+def test_service_bootstraps_tracker_after_restart(tmp_path):
+    """Сроки задач из файлового хранилища отслеживаются после перезапуска."""
+    path = str(tmp_path / "tasks.bin")
+    past = datetime.now() - timedelta(hours=1)
+    with MmapTaskRepository(path) as repo:
+        repo.add(make_task(None, past))
+        repo.add(make_task(None, past + timedelta(days=30)))
+        completed = make_task(None, past)
+        completed.change_status(TaskStatus.COMPLETED)
+        repo.add(completed)
+        repo.add(Task(None, "без срока", "", 1))
+    
+    with MmapTaskRepository(path) as repo:
+        service = TaskService(repo, ProjectRepository(), UserRepository())
+        # Сроки загружаются при первом обращении, а не при создании сервиса
+        assert service.deadline_tracker.overdue_by_project(1) == set()
+        assert [t.id for t in service.get_overdue_tasks_by_project(1)] == [1]
+        assert DeadlineTracker().bootstrap(repo.get_all()) == 2
+        assert [t.id for t in repo.find_open_with_due_date()] == [1, 2]
+
+
+def test_timers_follow_unit_of_work():
+    """Таймеры меняются только после фиксации и не переживают откат."""
+    user_repo, project_repo, task_repo = UserRepository(), ProjectRepository(), TaskRepository()
+    project_repo.add(Project(None, "проект", "", owner_id=1))
+    uow = UnitOfWork(user_repo, project_repo, task_repo)
+    service = TaskService(task_repo, project_repo, user_repo, uow)
+    task = service.create_task("задача", "", 1)
+    past = datetime.now() - timedelta(hours=1)
+    
+    with pytest.raises(RuntimeError):
+        with uow:
+            service.set_due_date(task.id, past)
+            service.update_task_status(task.id, TaskStatus.NEW)
+            raise RuntimeError
+    assert task_repo.get_by_id(task.id).due_date is None
+    assert service.get_overdue_tasks_by_project(1) == []
+    
+    with uow:
+        service.set_due_date(task.id, past)
+        assert service.get_overdue_tasks_by_project(1) == []
+    assert [t.id for t in service.get_overdue_tasks_by_project(1)] == [task.id]
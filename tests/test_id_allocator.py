@@ -0,0 +1,140 @@
+"""Тесты стратегий выдачи идентификаторов."""
+import multiprocessing
+import pickle
+import threading
+
+import pytest
+
+from src.repositories.id_allocator import (
+    BlockLeaseIdAllocator, SequentialIdAllocator, TimeOrderedIdAllocator
+)
+
+
+def _lease_ids(lease_path, count):
+    allocator = BlockLeaseIdAllocator(lease_path, block_size=7)
+    return [allocator.next_id() for _ in range(count)]
+
+
+def test_sequential_ids_and_release():
+    """Последовательные ID; вернуть можно только последний выданный."""
+    allocator = SequentialIdAllocator()
+    assert [allocator.next_id() for _ in range(3)] == [1, 2, 3]
+    allocator.release(2)
+    assert allocator.next_id() == 4
+    allocator.release(4)
+    assert allocator.next_id() == 4
+
+
+def test_sequential_is_thread_safe():
+    """ID не повторяются при выдаче из нескольких потоков."""
+    allocator = SequentialIdAllocator()
+    issued = []
+    
+    def worker():
+        ids = [allocator.next_id() for _ in range(1000)]
+        issued.extend(ids)
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(issued) == list(range(1, 8001))
+
+
+def test_block_lease_blocks_do_not_overlap(tmp_path):
+    """Два писателя с общим файлом получают непересекающиеся блоки."""
+    lease_path = str(tmp_path / "ids.lease")
+    first = BlockLeaseIdAllocator(lease_path, block_size=10)
+    second = BlockLeaseIdAllocator(lease_path, block_size=10)
+    
+    ids = [first.next_id() for _ in range(15)] + [second.next_id() for _ in range(15)]
+    assert len(set(ids)) == len(ids)
+    assert ids[:10] == list(range(1, 11))
+    assert first.leases == 2 and second.leases == 2
+
+
+def test_block_lease_survives_restart(tmp_path):
+    """После перезапуска выдача продолжается за последним арендованным блоком."""
+    lease_path = str(tmp_path / "ids.lease")
+    allocator = BlockLeaseIdAllocator(lease_path, block_size=100)
+    allocator.next_id()
+    
+    restarted = BlockLeaseIdAllocator(lease_path, block_size=100)
+    assert restarted.next_id() == 101
+
+
+def test_block_lease_across_processes(tmp_path):
+    """ID уникальны при одновременной аренде из нескольких процессов."""
+    lease_path = str(tmp_path / "ids.lease")
+    with multiprocessing.Pool(4) as pool:
+        chunks = pool.starmap(_lease_ids, [(lease_path, 50)] * 8)
+    ids = [value for chunk in chunks for value in chunk]
+    assert len(set(ids)) == len(ids) == 400
+
+
+def test_block_lease_rejects_bad_size(tmp_path):
+    with pytest.raises(ValueError):
+        BlockLeaseIdAllocator(str(tmp_path / "ids.lease"), block_size=0)
+
+
+def test_time_ordered_ids_are_increasing_and_carry_node():
+    """ID растут и содержат номер узла."""
+    allocator = TimeOrderedIdAllocator(node_id=5)
+    ids = [allocator.next_id() for _ in range(10000)]
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    node_mask = TimeOrderedIdAllocator.MAX_NODE_ID << TimeOrderedIdAllocator.SEQUENCE_BITS
+    assert all((value & node_mask) >> TimeOrderedIdAllocator.SEQUENCE_BITS == 5 for value in ids)
+
+
+def test_time_ordered_nodes_do_not_collide():
+    """Разные узлы выдают разные ID в одну и ту же миллисекунду."""
+    first = TimeOrderedIdAllocator(node_id=1)
+    second = TimeOrderedIdAllocator(node_id=2)
+    first._now_ms = second._now_ms = lambda: 1000
+    assert first.next_id() != second.next_id()
+
+
+def test_time_ordered_clock_going_back(monkeypatch):
+    """При переводе часов назад ID продолжают расти."""
+    allocator = TimeOrderedIdAllocator(node_id=0)
+    clock = iter([1000, 1000, 990, 995, 1001])
+    monkeypatch.setattr(allocator, "_now_ms", lambda: next(clock))
+    ids = [allocator.next_id() for _ in range(5)]
+    assert ids == sorted(ids) and len(set(ids)) == 5
+
+
+def test_time_ordered_sequence_overflow_waits_next_ms(monkeypatch):
+    """Переполнение порядкового номера ждет следующую миллисекунду."""
+    allocator = TimeOrderedIdAllocator(node_id=0)
+    ticks = iter([1000] * (allocator._SEQUENCE_MASK + 2) + [1001])
+    monkeypatch.setattr(allocator, "_now_ms", lambda: next(ticks))
+    ids = [allocator.next_id() for _ in range(allocator._SEQUENCE_MASK + 2)]
+    assert len(set(ids)) == len(ids)
+    assert ids[-1] >> (allocator.NODE_BITS + allocator.SEQUENCE_BITS) == 1001
+
+
+def test_time_ordered_rejects_bad_node():
+    with pytest.raises(ValueError):
+        TimeOrderedIdAllocator(node_id=TimeOrderedIdAllocator.MAX_NODE_ID + 1)
+
+
+def test_allocators_are_picklable(tmp_path):
+    """Генераторы сохраняются в снимках вместе с состоянием."""
+    allocator = SequentialIdAllocator()
+    allocator.next_id()
+    restored = pickle.loads(pickle.dumps(allocator))
+    assert restored.next_id() == 2
+    
+    lease = pickle.loads(pickle.dumps(BlockLeaseIdAllocator(str(tmp_path / "ids.lease"))))
+    assert lease.next_id() == 1
+
+
+def test_restored_block_lease_does_not_repeat_ids(tmp_path):
+    """Копия из pickle арендует новый блок, а не продолжает блок оригинала."""
+    allocator = BlockLeaseIdAllocator(str(tmp_path / "ids.lease"), block_size=10)
+    assert allocator.next_id() == 1
+    restored = pickle.loads(pickle.dumps(allocator))
+    ids = [restored.next_id(), allocator.next_id(), restored.next_id(), allocator.next_id()]
+    assert len(set(ids)) == 4
+    assert ids[0] == 11 and ids[1] == 2
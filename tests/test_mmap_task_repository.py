@@ -0,0 +1,182 @@
+"""Тесты файлового репозитория задач на mmap."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.task import Task, TaskStatus, Priority
+from src.repositories.mmap_task_repository import MmapTaskRepository
+from src.repositories.project_repository import ProjectRepository
+from src.repositories.unit_of_work import UnitOfWork
+from src.repositories.user_repository import UserRepository
+
+BASE = datetime(2026, 1, 1)
+
+
+def make_task(title, project_id=1, created_at=None, task_id=None):
+    task = Task(task_id, title, f"описание {title}", project_id, Priority.HIGH)
+    task.created_at = created_at or BASE
+    return task
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "tasks.bin")
+
+
+def test_roundtrip_after_reopen(path):
+    """Все поля задачи сохраняются после закрытия и повторного открытия."""
+    with MmapTaskRepository(path) as repo:
+        task = make_task("первая")
+        repo.add(task)
+        task.assign_to(7)
+        task.change_status(TaskStatus.COMPLETED)
+        task.set_due_date(BASE + timedelta(days=3))
+        repo.update(task)
+        repo.add(make_task("вторая", project_id=2))
+    
+    with MmapTaskRepository(path) as repo:
+        loaded = repo.get_by_id(1)
+        assert loaded.title == "первая"
+        assert loaded.description == "описание первая"
+        assert loaded.project_id == 1
+        assert loaded.priority == Priority.HIGH
+        assert loaded.assignee_id == 7
+        assert loaded.status == TaskStatus.COMPLETED
+        assert loaded.completed_at is not None
+        assert loaded.due_date == BASE + timedelta(days=3)
+        assert loaded.created_at == BASE
+        assert repo.get_by_id(2).due_date is None
+        assert [t.id for t in repo.get_all()] == [1, 2]
+        
+        # Продолжение нумерации после повторного открытия
+        task = make_task("третья")
+        repo.add(task)
+        assert task.id == 3
+
+
+def test_delete_and_filters(path):
+    """Удаленные задачи не возвращаются, фильтры читают колонки."""
+    with MmapTaskRepository(path) as repo:
+        for i in range(6):
+            task = make_task(f"задача {i}", project_id=i % 2 + 1)
+            repo.add(task)
+            if i % 3 == 0:
+                task.assign_to(5)
+                repo.update(task)
+        repo.delete(4)
+        
+        assert repo.get_by_id(4) is None
+        assert [t.id for t in repo.find_by_project(2)] == [2, 6]
+        assert [t.id for t in repo.find_by_assignee(5)] == [1]
+        assert [t.id for t in repo.find_by_status(TaskStatus.NEW)] == [1, 2, 3, 5, 6]
+        with pytest.raises(ValueError):
+            repo.delete(4)
+
+
+def test_readonly_reader_follows_writer_growth(path):
+    """Читатель видит записи, добавленные после роста файла писателем."""
+    writer = MmapTaskRepository(path)
+    writer.add(make_task("до роста"))
+    writer.flush()
+    reader = MmapTaskRepository(path, readonly=True)
+    try:
+        assert reader.get_by_id(1).title == "до роста"
+        
+        # Больше начальной емкости файла: писатель переотображает файл
+        for i in range(3000):
+            writer.add(make_task(f"задача {i}", created_at=BASE + timedelta(seconds=i)))
+        writer.flush()
+        
+        # Запросы по времени создания первыми обращаются к выросшему файлу
+        found = reader.find_created_between(BASE + timedelta(seconds=2998))
+        assert [t.title for t in found] == ["задача 2998", "задача 2999"]
+        assert reader.get_by_id(3001).title == "задача 2999"
+        assert len(reader.get_all()) == 3001
+        assert [t.title for t in reader.find_latest(2)] == ["задача 2999", "задача 2998"]
+        with pytest.raises(ValueError):
+            reader.add(make_task("запрещено"))
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_out_of_order_import(path):
+    """Импорт не по времени создания дает верные диапазоны и последние задачи."""
+    offsets = [5, 1, 4, 2, 3]
+    with MmapTaskRepository(path) as repo:
+        for offset in offsets:
+            repo.add(make_task(f"t{offset}", created_at=BASE + timedelta(hours=offset)))
+        
+        found = repo.find_created_between(BASE + timedelta(hours=2), BASE + timedelta(hours=5))
+        assert [t.title for t in found] == ["t2", "t3", "t4"]
+        assert [t.title for t in repo.find_latest(2)] == ["t5", "t4"]
+    
+    with MmapTaskRepository(path, readonly=True) as reader:
+        assert [t.title for t in reader.find_latest(1)] == ["t5"]
+
+
+def test_update_created_at_keeps_queries_correct(path):
+    """Изменение времени создания записанной задачи учитывается поиском."""
+    with MmapTaskRepository(path) as repo:
+        for hour in range(10):
+            repo.add(make_task(f"t{hour}", created_at=BASE + timedelta(hours=hour)))
+        task = repo.get_by_id(10)
+        task.created_at = BASE - timedelta(days=1)
+        repo.update(task)
+        
+        assert [t.id for t in repo.find_created_between(None, BASE)] == [10]
+        assert [t.id for t in repo.find_latest(1)] == [9]
+        
+        # Обновление без смены времени создания не меняет порядок
+        task = repo.get_by_id(3)
+        task.change_status(TaskStatus.COMPLETED)
+        repo.update(task)
+        assert [t.id for t in repo.find_created_between()][:2] == [10, 1]
+
+
+def test_id_gaps(path):
+    """Задачи с явными ID оставляют пропуски, которые не считаются задачами."""
+    with MmapTaskRepository(path) as repo:
+        repo.add(make_task("первая", created_at=BASE))
+        repo.add(make_task("десятая", task_id=10, created_at=BASE + timedelta(hours=1)))
+        
+        assert repo.get_by_id(5) is None
+        assert [t.id for t in repo.get_all()] == [1, 10]
+        assert [t.id for t in repo.find_created_between()] == [1, 10]
+        assert [t.id for t in repo.find_latest(5)] == [10, 1]
+        
+        # Пропуск можно заполнить позже
+        repo.add(make_task("пятая", task_id=5, created_at=BASE + timedelta(hours=2)))
+        assert [t.id for t in repo.find_latest(1)] == [5]
+        
+        task = make_task("следующая")
+        repo.add(task)
+        assert task.id == 11
+
+
+def test_rejects_foreign_file(path):
+    """Файл чужого формата не открывается."""
+    with open(path, "wb") as f:
+        f.write(b"\0" * 128)
+    with pytest.raises(ValueError):
+        MmapTaskRepository(path)
+
+
+def test_unit_of_work_rollback(path):
+    """Откат единицы работы восстанавливает записи и освобождает ID."""
+    with MmapTaskRepository(path) as repo:
+        repo.add(make_task("исходная"))
+        uow = UnitOfWork(UserRepository(), ProjectRepository(), repo)
+        with pytest.raises(RuntimeError):
+            with uow:
+                for task in repo.find_by_project(1):
+                    task.change_status(TaskStatus.COMPLETED)
+                    repo.update(task)
+                repo.add(make_task("откатываемая"))
+                raise RuntimeError
+        
+        assert repo.get_by_id(1).status == TaskStatus.NEW
+        assert repo.get_by_id(2) is None
+        task = make_task("следующая")
+        repo.add(task)
+        assert task.id == 2
@@ -0,0 +1,106 @@
+"""Тесты многоуровневого хранилища проектов и задач."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.project import Project
+from src.models.task import Task, TaskStatus
+from src.models.user import User
+from src.repositories.tiered_store import TieredStore
+from src.repositories.unit_of_work import UnitOfWork
+from src.repositories.user_repository import UserRepository
+from src.services.project_service import ProjectService
+from src.services.task_service import TaskService
+
+BASE = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TieredStore(str(tmp_path / "segment.bin"), max_resident=12)
+    moment = BASE
+    for number in range(6):
+        project = Project(None, f"проект {number}", "", owner_id=number % 2)
+        project.created_at = moment
+        store.project_repo.add(project)
+        for index in range(3):
+            moment += timedelta(minutes=1)
+            task = Task(None, f"задача {number}.{index}", "", project.id)
+            task.created_at = moment
+            if index == 0:
+                task.assign_to(100 + number % 2)
+            store.task_repo.add(task)
+    yield store
+    store.close()
+
+
+def test_budget_evicts_projects_with_tasks(store):
+    """Сверх бюджета проекты выгружаются вместе с задачами."""
+    assert store.resident <= 12
+    assert store.evictions > 0
+    assert store.is_cold(1)
+
+
+def test_scans_do_not_fault_cold_projects(store):
+    """Поиск возвращает холодные сущности копиями, не загружая их."""
+    cold_before = {i for i in range(1, 7) if store.is_cold(i)}
+    faults = store.faults
+    
+    tasks = store.task_repo.find_created_between()
+    assert [t.title for t in tasks[:2]] == ["задача 0.0", "задача 0.1"]
+    assert len(tasks) == 18
+    assert [t.title for t in store.task_repo.find_latest(1)] == ["задача 5.2"]
+    assert len(store.task_repo.find_by_assignee(100)) == 3
+    assert len(store.task_repo.find_by_status(TaskStatus.NEW)) == 18
+    assert len(store.project_repo.find_by_owner(1)) == 3
+    assert len(store.project_repo.find_created_between(BASE, BASE + timedelta(minutes=1))) == 1
+    assert len(store.project_repo.find_latest(10)) == 6
+    
+    assert store.faults == faults
+    assert {i for i in range(1, 7) if store.is_cold(i)} == cold_before
+
+
+def test_get_by_id_faults_and_update_refreshes_summary(store):
+    """Обращение по ID загружает проект; изменения видны поиску после выгрузки."""
+    task = store.task_repo.get_by_id(1)
+    assert not store.is_cold(1)
+    task.change_status(TaskStatus.COMPLETED)
+    store.task_repo.update(task)
+    
+    # Загрузка остальных проектов вытесняет первый обратно на диск
+    for project_id in range(2, 7):
+        store.project_repo.get_by_id(project_id)
+    assert store.is_cold(1)
+    
+    completed = store.task_repo.find_by_status(TaskStatus.COMPLETED)
+    assert [t.id for t in completed] == [1]
+    assert store.task_repo.get_by_id(1).status == TaskStatus.COMPLETED
+
+
+def test_rollback_after_cold_reads_keeps_project_tasks(tmp_path):
+    """Откат после чтения холодных задач не подменяет задачи проекта копиями."""
+    store = TieredStore(str(tmp_path / "segment.bin"), max_resident=4)
+    user_repo = UserRepository()
+    user_repo.add(User(None, "user", "user@example.com"))
+    uow = UnitOfWork(user_repo, store.project_repo, store.task_repo)
+    projects = ProjectService(store.project_repo, user_repo, uow, store.task_repo)
+    tasks = TaskService(store.task_repo, store.project_repo, user_repo, uow)
+    try:
+        first = projects.create_project("первый", "", 1)
+        task = tasks.create_task("задача", "", first.id)
+        tasks.assign_task(task.id, 1)
+        second = projects.create_project("второй", "", 1)
+        tasks.create_task("задача", "", second.id)
+        tasks.create_task("задача", "", second.id)
+        assert store.is_cold(first.id)
+        
+        with pytest.raises(RuntimeError):
+            with uow:
+                assert [t.id for t in tasks.get_tasks_by_user(1)] == [task.id]
+                raise RuntimeError
+        
+        tasks.update_task_status(task.id, TaskStatus.COMPLETED)
+        assert projects.get_project_progress(first.id) == 100.0
+    finally:
+        projects.close()
+        store.close()
@@ -0,0 +1,131 @@
+"""Тесты единицы работы."""
+import pytest
+
+from src.models.project import Project
+from src.models.task import Task, TaskStatus
+from src.models.user import User
+from src.repositories.project_repository import ProjectRepository
+from src.repositories.task_repository import TaskRepository
+from src.repositories.unit_of_work import UnitOfWork
+from src.repositories.user_repository import UserRepository
+from src.services.task_service import TaskService
+
+
+class RecordingTaskRepository(TaskRepository):
+    """Репозиторий задач, запоминающий пакеты фиксации."""
+    
+    def __init__(self, fail: bool = False):
+        super().__init__()
+        self.fail = fail
+        self.batches = []
+    
+    def commit_batch(self, new, dirty, deleted):
+        if self.fail:
+            raise IOError("хранилище недоступно")
+        self.batches.append(([t.id for t in new], [t.id for t in dirty], [t.id for t in deleted]))
+
+
+@pytest.fixture
+def repos():
+    user_repo, project_repo, task_repo = UserRepository(), ProjectRepository(), RecordingTaskRepository()
+    user_repo.add(User(None, "user", "user@example.com"))
+    project = Project(None, "проект", "", owner_id=1)
+    project_repo.add(project)
+    for index in range(3):
+        task = Task(None, f"задача {index}", "", project.id)
+        task_repo.add(task)
+        project.add_task(task)
+    return user_repo, project_repo, task_repo
+
+
+def test_commit_sends_one_batch(repos):
+    """Изменения фиксируются одним пакетом при выходе из блока."""
+    uow = UnitOfWork(*repos)
+    task_repo = repos[2]
+    with uow:
+        task = task_repo.get_by_id(1)
+        task.change_status(TaskStatus.IN_PROGRESS)
+        task_repo.update(task)
+        task_repo.add(Task(None, "новая", "", 1))
+        task_repo.delete(2)
+    
+    assert uow.commit_count == 1
+    assert task_repo.batches == [([4], [1], [2])]
+    assert not uow.active
+
+
+def test_rollback_restores_reads_and_releases_ids(repos):
+    """Откат восстанавливает прочитанные сущности, удаления и выданные ID."""
+    _, project_repo, task_repo = repos
+    uow = UnitOfWork(*repos)
+    with pytest.raises(RuntimeError):
+        with uow:
+            for task in task_repo.find_by_project(1):
+                task.change_status(TaskStatus.COMPLETED)
+                task_repo.update(task)
+            project = project_repo.get_by_id(1)
+            project.add_task(Task(None, "лишняя", "", 1))
+            task_repo.add(Task(None, "новая", "", 1))
+            task_repo.delete(3)
+            raise RuntimeError
+    
+    assert [t.status for t in task_repo.get_all()] == [TaskStatus.NEW] * 3
+    assert len(project_repo.get_by_id(1).tasks) == 3
+    assert task_repo.batches == []
+    task = Task(None, "следующая", "", 1)
+    task_repo.add(task)
+    assert task.id == 4
+
+
+def test_nested_blocks_commit_once(repos):
+    """Вложенные блоки фиксируются только при выходе из внешнего."""
+    uow = UnitOfWork(*repos)
+    task_repo = repos[2]
+    with uow:
+        with uow:
+            task_repo.add(Task(None, "внутренняя", "", 1))
+        assert task_repo.batches == []
+        assert uow.active
+    assert uow.commit_count == 1
+    assert task_repo.batches == [([4], [], [])]
+
+
+def test_inner_exception_rolls_back_outer_block(repos):
+    """Исключение во вложенном блоке откатывает всю единицу работы."""
+    uow = UnitOfWork(*repos)
+    task_repo = repos[2]
+    with pytest.raises(ValueError):
+        with uow:
+            task_repo.add(Task(None, "внешняя", "", 1))
+            with uow:
+                task_repo.add(Task(None, "внутренняя", "", 1))
+                raise ValueError
+    assert len(task_repo.get_all()) == 3
+    assert uow.commit_count == 0
+
+
+def test_repository_in_two_units_is_rejected(repos):
+    with UnitOfWork(*repos):
+        with pytest.raises(RuntimeError):
+            UnitOfWork(*repos).__enter__()
+
+
+def test_failed_commit_rolls_back(repos):
+    """Ошибка фиксации откатывает изменения и не оставляет их следующей транзакции."""
+    user_repo, project_repo, task_repo = repos
+    uow = UnitOfWork(*repos)
+    service = TaskService(task_repo, project_repo, user_repo, uow)
+    
+    task_repo.fail = True
+    with pytest.raises(IOError):
+        service.update_task_status(1, TaskStatus.COMPLETED)
+    assert task_repo.get_by_id(1).status == TaskStatus.NEW
+    
+    task_repo.fail = False
+    service.update_task_status(1, TaskStatus.IN_PROGRESS)
+    with pytest.raises(RuntimeError):
+        with uow:
+            task_repo.get_by_id(2)
+            raise RuntimeError
+    assert task_repo.get_by_id(1).status == TaskStatus.IN_PROGRESS
+    assert task_repo.batches == [([], [1], [])]